@@ -7,18 +7,150 @@ from the update.webhook table.
 
 Security:
 - Authentication required (API key or session)
-- Rate limiting recommended
+- Per-client token-bucket rate limiting
 - CORS support for external access
 """
 
-from odoo import http
+from odoo import http, api, SUPERUSER_ID
 from odoo.http import request, Response
+import functools
+import hashlib
+import hmac
 import json
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 _logger = logging.getLogger(__name__)
 
+_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, X-API-Key',
+}
+_OPTIONS_HEADERS = {**_CORS_HEADERS, 'Access-Control-Max-Age': '86400'}
+
+# Input bounds, checked before any parsing or DB work
+_MAX_PULL_LIMIT = 1000
+_MAX_WAIT_MS = 30000
+_MAX_MARK_IDS = 10000
+
+# [epoch second, ISO string] - response timestamps are rebuilt at most once per second
+_TS_CACHE = [0, '']
+
+
+def _iso_now():
+    """Return the current time as an ISO string, cached per second"""
+    now = int(time.time())
+    if now != _TS_CACHE[0]:
+        _TS_CACHE[1] = datetime.fromtimestamp(now).isoformat()
+        _TS_CACHE[0] = now
+    return _TS_CACHE[1]
+
+
+# Token buckets per client key, least recently used first:
+# {key: [tokens, last refill (monotonic)]}
+_RATE_BUCKETS = OrderedDict()
+_RATE_LOCK = threading.Lock()
+_RATE_MAX_KEYS = 10000
+
+
+def _rate_key(controller):
+    """
+    Identify the caller for rate limiting
+
+    Only an authenticated identity (a valid API key or a session user) gets
+    its own bucket; anything else is keyed on the remote address, so random
+    X-API-Key values can't mint fresh buckets.
+    """
+    api_key_valid = controller._request_api_key_valid()
+    if api_key_valid:
+        return 'api-key'
+    if api_key_valid is None and request.session.uid:
+        return f'uid:{request.session.uid}'
+    return request.httprequest.remote_addr
+
+
+def _rate_limited(rate=10, burst=50):
+    """
+    Shed excess requests before they reach the ORM
+
+    Each client key gets a token bucket refilled at ``rate`` tokens per
+    second up to ``burst``. Both limits can be overridden with the
+    ``webhook.rate_limit`` and ``webhook.rate_burst`` system parameters;
+    a rate of 0 disables limiting. Exhausted clients get a 429 with a
+    Retry-After header.
+
+    Args:
+        rate: Default sustained requests per second
+        burst: Default bucket capacity
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            get_param = request.env['ir.config_parameter'].sudo().get_param
+            try:
+                cur_rate = float(get_param('webhook.rate_limit', rate))
+                cur_burst = float(get_param('webhook.rate_burst', burst))
+            except ValueError:
+                cur_rate, cur_burst = rate, burst
+            if cur_rate <= 0:
+                return func(self, *args, **kwargs)
+
+            key = _rate_key(self)
+            now = time.monotonic()
+            with _RATE_LOCK:
+                bucket = _RATE_BUCKETS.get(key)
+                if bucket is None:
+                    # Evict the least recently seen clients, keeping the
+                    # active ones' buckets intact
+                    while len(_RATE_BUCKETS) >= _RATE_MAX_KEYS:
+                        _RATE_BUCKETS.popitem(last=False)
+                    bucket = _RATE_BUCKETS[key] = [cur_burst, now]
+                else:
+                    _RATE_BUCKETS.move_to_end(key)
+                    bucket[0] = min(cur_burst, bucket[0] + (now - bucket[1]) * cur_rate)
+                    bucket[1] = now
+                allowed = bucket[0] >= 1
+                if allowed:
+                    bucket[0] -= 1
+                else:
+                    retry_after = (1 - bucket[0]) / cur_rate
+
+            if not allowed:
+                response = self._error_response("Rate limit exceeded", status=429)
+                response.headers['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+                return response
+            return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _json_api(func):
+    """
+    Turn exceptions escaping an API handler into JSON error responses
+
+    ValueError (bad parameter conversion) becomes a 400, anything else is
+    logged with its traceback and becomes a 500.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        except ValueError as e:
+            return self._error_response(f"Invalid parameter: {e}", status=400)
+        except Exception as e:
+            _logger.error("API error in %s: %s", func.__name__, e, exc_info=True)
+            return self._error_response(f"Internal server error: {e}", status=500)
+    return wrapper
+
 
 class WebhookPullAPI(http.Controller):
     """
@@ -49,55 +181,133 @@ class WebhookPullAPI(http.Controller):
                 _logger.warning("No API key configured in system parameters")
                 return False
 
-            return api_key == valid_api_key
+            # Constant-time comparison so the key can't be probed by timing
+            return hmac.compare_digest(api_key.encode(), valid_api_key.encode())
 
         except Exception as e:
-            _logger.error(f"API key authentication failed: {e}")
+            _logger.error("API key authentication failed: %s", e)
             return False
 
-    def _get_auth_user(self):
+    def _request_api_key_valid(self):
         """
-        Get authenticated user from session or API key
+        Check the request's X-API-Key header, once per request
+
+        The rate limiter and _authenticated_uid() both need the answer; it
+        is kept on the request so the key is only checked once.
+
+        Returns:
+            True/False for a valid/invalid key, None when no key was sent
+        """
+        if not hasattr(request, '_webhook_api_key_valid'):
+            api_key = request.httprequest.headers.get('X-API-Key')
+            request._webhook_api_key_valid = (
+                self._authenticate_api_key(api_key) if api_key else None
+            )
+        return request._webhook_api_key_valid
+
+    def _authenticated_uid(self):
+        """
+        Get authenticated user ID from session or API key
 
         Returns:
-            User record or False
+            int user ID, or None if not authenticated
         """
         # Check for API key in header
-        api_key = request.httprequest.headers.get('X-API-Key')
+        api_key_valid = self._request_api_key_valid()
 
-        if api_key:
-            if self._authenticate_api_key(api_key):
-                # Return admin user for API key authentication
-                return request.env.ref('base.user_admin')
-            else:
-                return False
+        if api_key_valid is not None:
+            if api_key_valid:
+                # API key requests act as the admin user
+                return request.env['res.users'].sudo()._webhook_api_uid()
+            return None
 
         # Check for session authentication
-        if request.session.uid:
-            return request.env['res.users'].sudo().browse(request.session.uid)
+        return request.session.uid or None
+
+    def _parse_json_body(self):
+        """
+        Parse the JSON request body
+
+        Feeds the raw bytes straight to the decoder (no intermediate
+        UTF-8 decode) and uses orjson when it is installed.
+
+        Returns:
+            Parsed JSON data (empty dict for an empty body)
+        """
+        data = request.httprequest.get_data(cache=False) or b'{}'
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    def _dumps(self, data, pretty=False):
+        """
+        Serialize data to JSON bytes
 
-        return False
+        Uses orjson when installed, compact stdlib json otherwise, and
+        indented stdlib json when pretty is requested. Data must already be
+        JSON-native: models format dates as ISO strings before returning.
+        """
+        if pretty:
+            return json.dumps(data, indent=2).encode()
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, separators=(',', ':')).encode()
+
+    def _stream_json(self, events, meta_fn, pretty=False, raw_payload=False):
+        """
+        Serialize a pull result as a stream of JSON chunks
+
+        Emits {"events": [...], <meta>} with each event encoded as it is
+        produced, so the full payload is never built in memory.
+
+        Args:
+            events: Iterable of event dicts
+            meta_fn: Callable (last_id, count) -> dict of top-level keys
+                written after the events array
+            pretty: Indent the output
+            raw_payload: Event payloads are already JSON text and are
+                spliced into the output as-is (ignored when pretty)
+
+        Yields:
+            bytes: JSON fragments
+        """
+        yield b'{"events":['
+        last_id = None
+        count = 0
+        for event in events:
+            if count:
+                yield b','
+            if raw_payload and not pretty:
+                payload = event.pop('payload')
+                yield self._dumps(event)[:-1]
+                yield b',"payload":' + (payload or 'null').encode() + b'}'
+            else:
+                yield self._dumps(event, pretty)
+            last_id = event['id']
+            count += 1
+        # Drop the opening brace of the meta object to append its keys
+        yield b'],' + self._dumps(meta_fn(last_id, count), pretty)[1:]
 
-    def _make_response(self, data, status=200):
+    def _make_response(self, data, status=200, headers=None):
         """
         Create JSON response
 
+        Output is compact; pass ?pretty=1 to get indented JSON when
+        debugging by hand.
+
         Args:
             data: Data to serialize
             status: HTTP status code
+            headers: Extra headers merged over the CORS headers (optional)
 
         Returns:
             HTTP Response
         """
         return Response(
-            json.dumps(data, indent=2, default=str),
+            self._dumps(data, request.httprequest.args.get('pretty')),
             status=status,
             mimetype='application/json',
-            headers={
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type, X-API-Key',
-            }
+            headers={**_CORS_HEADERS, **headers} if headers else _CORS_HEADERS,
         )
 
     def _error_response(self, message, status=400):
@@ -114,19 +324,23 @@ class WebhookPullAPI(http.Controller):
         return self._make_response({
             'error': True,
             'message': message,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _iso_now(),
         }, status=status)
 
-    @http.route('/api/webhooks/pull', type='http', auth='public', methods=['GET', 'POST'], csrf=False, cors='*')
+    @http.route('/api/webhooks/pull', type='http', auth='public', methods=['GET', 'POST'], csrf=False)
+    @_rate_limited()
+    @_json_api
     def pull_events(self, **kwargs):
         """
         Pull webhook events from update.webhook table
 
         Query Parameters (GET) or JSON Body (POST):
             last_event_id (int): Last event ID that was pulled (default: 0)
-            limit (int): Maximum number of events to return (default: 100, max: 1000)
+            limit (int): Maximum number of events to return (default: 100, clamped to 1-1000)
             models (list): List of model names to filter (optional)
             priority (str): Priority filter (high/medium/low) (optional)
+            wait_ms (int): When no new events exist, hold the request open
+                up to this long for one to arrive (default: 0, max: 30000)
 
         Returns:
             JSON response with events data:
@@ -149,54 +363,108 @@ class WebhookPullAPI(http.Controller):
                 "priority": "high"
             }
         """
-        try:
-            # Authenticate
-            user = self._get_auth_user()
-            if not user:
-                return self._error_response("Authentication required", status=401)
+        # Authenticate
+        uid = self._authenticated_uid()
+        if not uid:
+            return self._error_response("Authentication required", status=401)
 
-            # Get parameters from GET or POST
-            if request.httprequest.method == 'POST':
+        # Get parameters from GET or POST
+        if request.httprequest.method == 'POST':
+            try:
+                params = self._parse_json_body()
+            except Exception as e:
+                return self._error_response(f"Invalid JSON body: {str(e)}", status=400)
+        else:
+            params = kwargs
+
+        # Extract and validate parameters
+        last_event_id = int(params.get('last_event_id', 0))
+        raw_limit = params.get('limit', 100)
+        if len(str(raw_limit)) > 7:
+            return self._error_response("Invalid parameter: limit out of range", status=400)
+        limit = max(1, min(int(raw_limit), _MAX_PULL_LIMIT))
+        raw_wait = params.get('wait_ms', 0)
+        if len(str(raw_wait)) > 7:
+            return self._error_response("Invalid parameter: wait_ms out of range", status=400)
+        wait_ms = max(0, min(int(raw_wait), _MAX_WAIT_MS))
+        models = params.get('models')
+        priority = params.get('priority')
+
+        # Convert models string to list if needed
+        if isinstance(models, str):
+            models = [m.strip() for m in models.split(',') if m.strip()]
+
+        _logger.info("Pull request: last_id=%s, limit=%s, models=%s, priority=%s", last_event_id, limit, models, priority)
+
+        # Cheap idle-poll check: nothing newer than the client's cursor
+        max_id = request.env['update.webhook'].sudo()._max_event_id()
+        if max_id <= last_event_id and wait_ms > 0:
+            max_id = request.env['update.webhook'].sudo()._wait_for_events(
+                last_event_id, wait_ms / 1000.0)
+
+        if max_id <= last_event_id:
+            # Only the idle answer is cacheable: a page of events also depends
+            # on their processed state, which max_id does not reflect. The
+            # tag still covers the cursor and filters the answer is for.
+            etag_key = json.dumps([max_id, last_event_id, limit, models, priority])
+            etag = 'W/"%s"' % hashlib.sha1(etag_key.encode()).hexdigest()[:20]
+            if request.httprequest.headers.get('If-None-Match') == etag:
+                return Response(status=304, headers={**_CORS_HEADERS, 'ETag': etag})
+            return self._make_response({
+                'events': [],
+                'last_id': last_event_id,
+                'has_more': False,
+                'count': 0,
+                'success': True,
+                'timestamp': _iso_now(),
+            }, headers={'ETag': etag})
+
+        # Stream events from a dedicated cursor: the response body is
+        # produced after this handler returns and the request cursor closes
+        registry = request.env.registry
+        pretty = request.httprequest.args.get('pretty')
+
+        def generate():
+            with registry.cursor() as cr:
+                env = api.Environment(cr, SUPERUSER_ID, {})
+                UpdateWebhook = env['update.webhook']
+
+                def meta(last_id, count):
+                    if not count:
+                        last_id = last_event_id
+                    return {
+                        'last_id': last_id,
+                        'has_more': bool(count) and UpdateWebhook._has_pending_after(last_id),
+                        'count': count,
+                        'success': True,
+                        'timestamp': _iso_now(),
+                    }
+
+                events = UpdateWebhook.iter_events(
+                    last_event_id=last_event_id,
+                    limit=limit,
+                    models=models,
+                    priority=priority,
+                    raw_payload=not pretty,
+                )
                 try:
-                    params = json.loads(request.httprequest.data.decode('utf-8'))
-                except Exception as e:
-                    return self._error_response(f"Invalid JSON body: {str(e)}", status=400)
-            else:
-                params = kwargs
-
-            # Extract and validate parameters
-            last_event_id = int(params.get('last_event_id', 0))
-            limit = min(int(params.get('limit', 100)), 1000)  # Max 1000
-            models = params.get('models')
-            priority = params.get('priority')
-
-            # Convert models string to list if needed
-            if isinstance(models, str):
-                models = [m.strip() for m in models.split(',') if m.strip()]
-
-            _logger.info(f"Pull request: last_id={last_event_id}, limit={limit}, models={models}, priority={priority}")
-
-            # Pull events using model method
-            result = request.env['update.webhook'].sudo().pull_events(
-                last_event_id=last_event_id,
-                limit=limit,
-                models=models,
-                priority=priority
-            )
+                    yield from self._stream_json(events, meta, pretty, raw_payload=not pretty)
+                except Exception:
+                    _logger.error("Pull events stream failed", exc_info=True)
+                    raise
 
-            # Add success flag and timestamp
-            result['success'] = True
-            result['timestamp'] = datetime.now().isoformat()
+        return Response(
+            generate(),
+            status=200,
+            mimetype='application/json',
+            headers=_CORS_HEADERS,
+            direct_passthrough=True,
+        )
 
-            return self._make_response(result)
 
-        except ValueError as e:
-            return self._error_response(f"Invalid parameter: {str(e)}", status=400)
-        except Exception as e:
-            _logger.error(f"Pull events failed: {e}", exc_info=True)
-            return self._error_response(f"Internal server error: {str(e)}", status=500)
-
-    @http.route('/api/webhooks/mark-processed', type='http', auth='public', methods=['POST'], csrf=False, cors='*')
+    @http.route('/api/webhooks/mark-processed', type='http', auth='public', methods=['POST'], csrf=False)
+    @_rate_limited()
+    @_json_api
     def mark_processed(self, **kwargs):
         """
         Mark events as processed
@@ -218,44 +486,47 @@ class WebhookPullAPI(http.Controller):
                 "event_ids": [101, 102, 103, 104, 105]
             }
         """
+        # Authenticate
+        uid = self._authenticated_uid()
+        if not uid:
+            return self._error_response("Authentication required", status=401)
+
+        # Get request body
         try:
-            # Authenticate
-            user = self._get_auth_user()
-            if not user:
-                return self._error_response("Authentication required", status=401)
+            data = self._parse_json_body()
+        except Exception as e:
+            return self._error_response(f"Invalid JSON body: {str(e)}", status=400)
 
-            # Get request body
-            try:
-                data = json.loads(request.httprequest.data.decode('utf-8'))
-            except Exception as e:
-                return self._error_response(f"Invalid JSON body: {str(e)}", status=400)
+        # Get event IDs
+        event_ids = data.get('event_ids', [])
 
-            # Get event IDs
-            event_ids = data.get('event_ids', [])
+        if not event_ids or not isinstance(event_ids, list):
+            return self._error_response("event_ids must be a non-empty list", status=400)
 
-            if not event_ids or not isinstance(event_ids, list):
-                return self._error_response("event_ids must be a non-empty list", status=400)
+        if len(event_ids) > _MAX_MARK_IDS:
+            return self._error_response(
+                f"Too many event_ids (max {_MAX_MARK_IDS} per request)", status=413
+            )
 
-            _logger.info(f"Marking {len(event_ids)} events as processed")
+        _logger.info("Marking %s events as processed", len(event_ids))
 
-            # Mark as processed
-            success = request.env['update.webhook'].sudo().mark_batch_as_processed(event_ids)
+        # Mark as processed
+        processed_count = request.env['update.webhook'].sudo().mark_batch_as_processed(event_ids)
 
-            if success:
-                return self._make_response({
-                    'success': True,
-                    'processed_count': len(event_ids),
-                    'message': f'{len(event_ids)} event(s) marked as processed',
-                    'timestamp': datetime.now().isoformat(),
-                })
-            else:
-                return self._error_response("Failed to mark events as processed", status=500)
+        if processed_count is not False:
+            return self._make_response({
+                'success': True,
+                'processed_count': processed_count,
+                'message': f'{processed_count} event(s) marked as processed',
+                'timestamp': _iso_now(),
+            })
+        else:
+            return self._error_response("Failed to mark events as processed", status=500)
 
-        except Exception as e:
-            _logger.error(f"Mark processed failed: {e}", exc_info=True)
-            return self._error_response(f"Internal server error: {str(e)}", status=500)
 
-    @http.route('/api/webhooks/stats', type='http', auth='public', methods=['GET'], csrf=False, cors='*')
+    @http.route('/api/webhooks/stats', type='http', auth='public', methods=['GET'], csrf=False)
+    @_rate_limited()
+    @_json_api
     def get_statistics(self, **kwargs):
         """
         Get webhook statistics
@@ -281,33 +552,27 @@ class WebhookPullAPI(http.Controller):
         Example:
             GET /api/webhooks/stats?days=30
         """
-        try:
-            # Authenticate
-            user = self._get_auth_user()
-            if not user:
-                return self._error_response("Authentication required", status=401)
+        # Authenticate
+        uid = self._authenticated_uid()
+        if not uid:
+            return self._error_response("Authentication required", status=401)
 
-            # Get days parameter
-            days = int(kwargs.get('days', 7))
+        # Get days parameter
+        days = int(kwargs.get('days', 7))
 
-            _logger.info(f"Getting statistics for last {days} days")
+        _logger.info("Getting statistics for last %s days", days)
 
-            # Get statistics
-            stats = request.env['update.webhook'].sudo().get_statistics(days=days)
+        # Get statistics
+        stats = request.env['update.webhook'].sudo().get_statistics(days=days)
 
-            return self._make_response({
-                'success': True,
-                'stats': stats,
-                'timestamp': datetime.now().isoformat(),
-            })
+        return self._make_response({
+            'success': True,
+            'stats': stats,
+            'timestamp': _iso_now(),
+        })
 
-        except ValueError as e:
-            return self._error_response(f"Invalid parameter: {str(e)}", status=400)
-        except Exception as e:
-            _logger.error(f"Get statistics failed: {e}", exc_info=True)
-            return self._error_response(f"Internal server error: {str(e)}", status=500)
 
-    @http.route('/api/webhooks/health', type='http', auth='public', methods=['GET'], csrf=False, cors='*')
+    @http.route('/api/webhooks/health', type='http', auth='public', methods=['GET'], csrf=False)
     def health_check(self, **kwargs):
         """
         Health check endpoint
@@ -322,41 +587,37 @@ class WebhookPullAPI(http.Controller):
         """
         try:
             # Get pending events count
-            pending_count = request.env['update.webhook'].sudo().search_count([
-                ('is_processed', '=', False),
-                ('is_archived', '=', False),
-            ])
+            pending_count = request.env['update.webhook'].sudo()._fast_pending_count()
 
             return self._make_response({
                 'status': 'healthy',
                 'version': '2.0.0',
                 'module': 'auto_webhook',
                 'pending_events': pending_count,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': _iso_now(),
             })
 
         except Exception as e:
-            _logger.error(f"Health check failed: {e}", exc_info=True)
+            _logger.error("Health check failed: %s", e, exc_info=True)
             return self._error_response(f"Unhealthy: {str(e)}", status=503)
 
-    @http.route('/api/webhooks/options', type='http', auth='public', methods=['OPTIONS'], csrf=False, cors='*')
+    @http.route(['/api/webhooks/options', '/api/webhooks/<path:subpath>'],
+                type='http', auth='public', methods=['OPTIONS'], csrf=False)
     def options_handler(self, **kwargs):
         """
         Handle CORS preflight requests
+
+        Routes do not use the framework's cors option (which would add
+        its own headers on top of _CORS_HEADERS), so preflight for every
+        endpoint is answered here.
         """
-        return Response(
-            status=200,
-            headers={
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type, X-API-Key',
-                'Access-Control-Max-Age': '86400',
-            }
-        )
+        return Response(status=200, headers=_OPTIONS_HEADERS)
 
     # ===== User Sync State Endpoints =====
 
-    @http.route('/api/webhooks/sync-state', type='http', auth='public', methods=['GET', 'POST'], csrf=False, cors='*')
+    @http.route('/api/webhooks/sync-state', type='http', auth='public', methods=['GET', 'POST'], csrf=False)
+    @_rate_limited()
+    @_json_api
     def get_or_create_sync_state(self, **kwargs):
         """
         Get or create sync state for a user/device
@@ -371,66 +632,62 @@ class WebhookPullAPI(http.Controller):
         Returns:
             JSON response with sync state data
         """
-        try:
-            # Authenticate
-            user = self._get_auth_user()
-            if not user:
-                return self._error_response("Authentication required", status=401)
+        # Authenticate
+        uid = self._authenticated_uid()
+        if not uid:
+            return self._error_response("Authentication required", status=401)
 
-            # Get parameters from GET or POST
-            if request.httprequest.method == 'POST':
-                try:
-                    params = json.loads(request.httprequest.data.decode('utf-8'))
-                except Exception as e:
-                    return self._error_response(f"Invalid JSON body: {str(e)}", status=400)
-            else:
-                params = kwargs
-
-            # Extract and validate parameters
-            user_id = int(params.get('user_id', 0))
-            device_id = params.get('device_id', '').strip()
-            app_type = params.get('app_type', 'mobile_app')
-            device_info = params.get('device_info', '')
-            app_version = params.get('app_version', '')
-
-            if not user_id or not device_id:
-                return self._error_response("user_id and device_id are required", status=400)
-
-            _logger.info(f"Get or create sync state: user_id={user_id}, device_id={device_id}, app_type={app_type}")
-
-            # Get or create sync state
-            sync_state = request.env['user.sync.state'].sudo().get_or_create_state(
-                user_id=user_id,
-                device_id=device_id,
-                app_type=app_type
-            )
+        # Get parameters from GET or POST
+        if request.httprequest.method == 'POST':
+            try:
+                params = self._parse_json_body()
+            except Exception as e:
+                return self._error_response(f"Invalid JSON body: {str(e)}", status=400)
+        else:
+            params = kwargs
+
+        # Extract and validate parameters
+        user_id = int(params.get('user_id', 0))
+        device_id = params.get('device_id', '').strip()
+        app_type = params.get('app_type', 'mobile_app')
+        device_info = params.get('device_info', '')
+        app_version = params.get('app_version', '')
+
+        if not user_id or not device_id:
+            return self._error_response("user_id and device_id are required", status=400)
+
+        _logger.info("Get or create sync state: user_id=%s, device_id=%s, app_type=%s", user_id, device_id, app_type)
+
+        # Get or create sync state
+        sync_state = request.env['user.sync.state'].sudo().get_or_create_state(
+            user_id=user_id,
+            device_id=device_id,
+            app_type=app_type
+        )
 
-            # Update device info and app version if provided
-            if device_info or app_version:
-                state_record = request.env['user.sync.state'].sudo().browse(sync_state['id'])
-                update_vals = {}
-                if device_info:
-                    update_vals['device_info'] = device_info
-                if app_version:
-                    update_vals['app_version'] = app_version
-                if update_vals:
-                    state_record.write(update_vals)
-                    sync_state['device_info'] = device_info
-                    sync_state['app_version'] = app_version
+        # Update device info and app version if provided
+        if device_info or app_version:
+            state_record = request.env['user.sync.state'].sudo().browse(sync_state['id'])
+            update_vals = {}
+            if device_info:
+                update_vals['device_info'] = device_info
+            if app_version:
+                update_vals['app_version'] = app_version
+            if update_vals:
+                state_record.write(update_vals)
+                sync_state['device_info'] = device_info
+                sync_state['app_version'] = app_version
 
-            return self._make_response({
-                'success': True,
-                'sync_state': sync_state,
-                'timestamp': datetime.now().isoformat(),
-            })
+        return self._make_response({
+            'success': True,
+            'sync_state': sync_state,
+            'timestamp': _iso_now(),
+        })
 
-        except ValueError as e:
-            return self._error_response(f"Invalid parameter: {str(e)}", status=400)
-        except Exception as e:
-            _logger.error(f"Get or create sync state failed: {e}", exc_info=True)
-            return self._error_response(f"Internal server error: {str(e)}", status=500)
 
-    @http.route('/api/webhooks/sync-state/update', type='http', auth='public', methods=['POST'], csrf=False, cors='*')
+    @http.route('/api/webhooks/sync-state/update', type='http', auth='public', methods=['POST'], csrf=False)
+    @_rate_limited()
+    @_json_api
     def update_sync_state(self, **kwargs):
         """
         Update sync state after pulling events
@@ -444,56 +701,52 @@ class WebhookPullAPI(http.Controller):
         Returns:
             JSON response with updated sync state
         """
-        try:
-            # Authenticate
-            user = self._get_auth_user()
-            if not user:
-                return self._error_response("Authentication required", status=401)
+        # Authenticate
+        uid = self._authenticated_uid()
+        if not uid:
+            return self._error_response("Authentication required", status=401)
 
-            # Get request body
-            try:
-                data = json.loads(request.httprequest.data.decode('utf-8'))
-            except Exception as e:
-                return self._error_response(f"Invalid JSON body: {str(e)}", status=400)
+        # Get request body
+        try:
+            data = self._parse_json_body()
+        except Exception as e:
+            return self._error_response(f"Invalid JSON body: {str(e)}", status=400)
 
-            # Extract and validate parameters
-            user_id = int(data.get('user_id', 0))
-            device_id = data.get('device_id', '').strip()
-            last_event_id = int(data.get('last_event_id', 0))
-            events_synced = int(data.get('events_synced', 0))
+        # Extract and validate parameters
+        user_id = int(data.get('user_id', 0))
+        device_id = data.get('device_id', '').strip()
+        last_event_id = int(data.get('last_event_id', 0))
+        events_synced = int(data.get('events_synced', 0))
 
-            if not user_id or not device_id:
-                return self._error_response("user_id and device_id are required", status=400)
+        if not user_id or not device_id:
+            return self._error_response("user_id and device_id are required", status=400)
 
-            if last_event_id < 0:
-                return self._error_response("last_event_id must be non-negative", status=400)
+        if last_event_id < 0:
+            return self._error_response("last_event_id must be non-negative", status=400)
 
-            _logger.info(f"Update sync state: user_id={user_id}, device_id={device_id}, last_event_id={last_event_id}")
+        _logger.info("Update sync state: user_id=%s, device_id=%s, last_event_id=%s", user_id, device_id, last_event_id)
 
-            # Update sync state
-            result = request.env['user.sync.state'].sudo().update_sync_state(
-                user_id=user_id,
-                device_id=device_id,
-                last_event_id=last_event_id,
-                events_synced=events_synced
-            )
+        # Update sync state
+        result = request.env['user.sync.state'].sudo().update_sync_state(
+            user_id=user_id,
+            device_id=device_id,
+            last_event_id=last_event_id,
+            events_synced=events_synced
+        )
 
-            if result:
-                return self._make_response({
-                    'success': True,
-                    'sync_state': result,
-                    'timestamp': datetime.now().isoformat(),
-                })
-            else:
-                return self._error_response("Sync state not found", status=404)
+        if result:
+            return self._make_response({
+                'success': True,
+                'sync_state': result,
+                'timestamp': _iso_now(),
+            })
+        else:
+            return self._error_response("Sync state not found", status=404)
 
-        except ValueError as e:
-            return self._error_response(f"Invalid parameter: {str(e)}", status=400)
-        except Exception as e:
-            _logger.error(f"Update sync state failed: {e}", exc_info=True)
-            return self._error_response(f"Internal server error: {str(e)}", status=500)
 
-    @http.route('/api/webhooks/sync-state/stats', type='http', auth='public', methods=['GET'], csrf=False, cors='*')
+    @http.route('/api/webhooks/sync-state/stats', type='http', auth='public', methods=['GET'], csrf=False)
+    @_rate_limited()
+    @_json_api
     def get_sync_statistics(self, **kwargs):
         """
         Get sync statistics for a user
@@ -506,37 +759,30 @@ class WebhookPullAPI(http.Controller):
         Returns:
             JSON response with sync statistics
         """
-        try:
-            # Authenticate
-            user = self._get_auth_user()
-            if not user:
-                return self._error_response("Authentication required", status=401)
-
-            # Get parameters
-            user_id = int(kwargs.get('user_id', 0))
-            device_id = kwargs.get('device_id', '').strip()
-            app_type = kwargs.get('app_type', '').strip()
-
-            if not user_id:
-                return self._error_response("user_id is required", status=400)
-
-            _logger.info(f"Get sync statistics: user_id={user_id}, device_id={device_id}, app_type={app_type}")
-
-            # Get statistics
-            stats = request.env['user.sync.state'].sudo().get_sync_statistics(
-                user_id=user_id,
-                device_id=device_id if device_id else None,
-                app_type=app_type if app_type else None
-            )
-
-            return self._make_response({
-                'success': True,
-                'stats': stats,
-                'timestamp': datetime.now().isoformat(),
-            })
+        # Authenticate
+        uid = self._authenticated_uid()
+        if not uid:
+            return self._error_response("Authentication required", status=401)
+
+        # Get parameters
+        user_id = int(kwargs.get('user_id', 0))
+        device_id = kwargs.get('device_id', '').strip()
+        app_type = kwargs.get('app_type', '').strip()
+
+        if not user_id:
+            return self._error_response("user_id is required", status=400)
+
+        _logger.info("Get sync statistics: user_id=%s, device_id=%s, app_type=%s", user_id, device_id, app_type)
+
+        # Get statistics
+        stats = request.env['user.sync.state'].sudo().get_sync_statistics(
+            user_id=user_id,
+            device_id=device_id if device_id else None,
+            app_type=app_type if app_type else None
+        )
 
-        except ValueError as e:
-            return self._error_response(f"Invalid parameter: {str(e)}", status=400)
-        except Exception as e:
-            _logger.error(f"Get sync statistics failed: {e}", exc_info=True)
-            return self._error_response(f"Internal server error: {str(e)}", status=500)
+        return self._make_response({
+            'success': True,
+            'stats': stats,
+            'timestamp': _iso_now(),
+        })
@@ -1,3 +1,5 @@
+from odoo.tools import config
+
 # Core webhook models
 from . import webhook_event
 from . import webhook_config
@@ -10,10 +12,12 @@ from . import update_webhook  # New: Pull-based event storage
 from . import user_sync_state  # New: Track sync state for BridgeCore Smart Sync
 from . import webhook_rule  # New: Config-driven webhook rules
 from . import base_webhook_hook  # New: Universal base hook (replaces webhook_mixin)
+from . import res_users
 
 # Legacy models (deprecated - kept for backward compatibility)
-# Note: webhook_mixin and list_model are deprecated in favor of base_webhook_hook + webhook_rule
-# These are commented out to prevent duplicate event creation
-# from . import webhook_mixin
-# from . import webhook_webhook
-# from . import list_model
\ No newline at end of file
+# Note: webhook.mixin and list_model are deprecated in favor of base_webhook_hook + webhook_rule
+# They create duplicate events alongside the base hook, so they are only
+# imported when the server config sets auto_webhook_legacy = True
+if config.get('auto_webhook_legacy'):
+    from . import webhook  # webhook.mixin
+    from . import list_model
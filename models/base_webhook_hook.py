@@ -11,6 +11,10 @@ Key Features:
 - Thread-safe caching
 - Fail-safe error handling (never blocks business operations)
 - Context-based disabling for batch operations
+- Create and write webhooks run in a precommit hook, inside the
+  business transaction but off the create()/write() call path
+- Batched mode (context webhook_batch=True): update.webhook events are
+  queued and inserted in one statement before commit
 
 Usage:
 - Create webhook.rule for a model from UI
@@ -18,18 +22,89 @@ Usage:
 - No code changes needed per model
 
 Performance:
-- Uses class-level cache for tracked models
+- Tracked models, configs and field plans are kept in ormcache
 - Early exit if model not tracked (~0.01ms overhead)
 - Lazy loading of rules only when needed
 """
 
-from odoo import models, api, fields
+from odoo import models, api, fields, tools
 import logging
+import sys
+from collections import OrderedDict
 import threading
 import time
 
 _logger = logging.getLogger(__name__)
 
+# Models never tracked: technical prefixes and the webhook models themselves
+_WH_EXCLUDED_PREFIXES = ('ir.', 'base.')
+_WH_EXCLUDED_MODELS = frozenset(sys.intern(name) for name in (
+    'webhook.rule', 'webhook.event', 'update.webhook',
+    'webhook.config', 'webhook.subscriber', 'webhook.audit',
+    'webhook.retry', 'webhook.template', 'user.sync.state',
+    'webhook.errors', 'webhook.cleanup.cron',
+))
+
+# Payload field type codes, resolved once per field plan
+_WH_FIELD_OTHER = 0
+_WH_FIELD_M2O = 1
+_WH_FIELD_X2M = 2
+_WH_FIELD_TEMPORAL = 3
+_WH_FIELD_BINARY = 4
+_WH_FIELD_CODES = {
+    'many2one': _WH_FIELD_M2O,
+    'one2many': _WH_FIELD_X2M,
+    'many2many': _WH_FIELD_X2M,
+    'date': _WH_FIELD_TEMPORAL,
+    'datetime': _WH_FIELD_TEMPORAL,
+    'binary': _WH_FIELD_BINARY,
+}
+
+# Fields left out of config payloads when no field filter is set (besides
+# private '_' fields; '__last_update' is listed for clarity)
+_WH_PAYLOAD_SKIP_FIELDS = frozenset({
+    'create_uid', 'write_uid', '__last_update',
+    'message_ids', 'message_follower_ids', 'activity_ids',
+})
+
+# Returned when a model has no rules for an operation: recordsets are bound to
+# an environment and cannot be shared, but callers only iterate and test it
+_WH_NO_RULES = ()
+
+
+def _webhook_build_field_plan(model_fields, field_names=None):
+    """
+    Payload field plan of a model
+
+    Args:
+        model_fields: The model's _fields mapping
+        field_names: Fields to include, or None for all but internal ones
+
+    Returns:
+        tuple: (field_name, _WH_FIELD_* code) pairs in payload order
+    """
+    if field_names is None:
+        field_names = [
+            f for f in model_fields
+            if f[0] != '_' and f not in _WH_PAYLOAD_SKIP_FIELDS
+        ]
+    plan = []
+    for field_name in field_names:
+        field = model_fields.get(field_name)
+        # Skip unknown and computed non-stored fields
+        if not field or (field.compute and not field.store):
+            continue
+        plan.append((field_name, _WH_FIELD_CODES.get(field.type, _WH_FIELD_OTHER)))
+    return tuple(plan)
+
+
+def _webhook_clear_registry_cache(registry):
+    """Clear the registry's ormcache (signaled to the other workers)"""
+    if hasattr(registry, 'clear_cache'):
+        registry.clear_cache()
+    else:
+        registry.clear_caches()
+
 
 class BaseWebhookHook(models.AbstractModel):
     """
@@ -45,8 +120,12 @@ class BaseWebhookHook(models.AbstractModel):
     # Prevents multiple webhook triggers for same record within short time
     # ═══════════════════════════════════════════════════════════
     
-    _webhook_debounce_cache = {}  # {model:record_id: timestamp}
-    _webhook_debounce_lock = threading.Lock()
+    _DEBOUNCE_SHARDS = 32  # Power of two: shard index is hash & (N - 1)
+    _DEBOUNCE_SHARD_SIZE = 100000 // _DEBOUNCE_SHARDS  # Bounds the cache to ~100k entries
+    # {key: monotonic time}, oldest first: expiry and eviction pop from the front
+    _webhook_debounce_shards = [OrderedDict() for _ in range(_DEBOUNCE_SHARDS)]
+    _webhook_debounce_locks = [threading.Lock() for _ in range(_DEBOUNCE_SHARDS)]
+    _webhook_debounce_tls = threading.local()  # .last = (key, time) of this thread's last trigger
     _DEBOUNCE_SECONDS = 3  # Don't trigger again within 3 seconds
 
     # ═══════════════════════════════════════════════════════════
@@ -58,26 +137,21 @@ class BaseWebhookHook(models.AbstractModel):
         """
         Override create to trigger webhooks based on rules
         """
+        # Fast path: untracked models pay a single set lookup
+        if not self._webhook_is_model_tracked():
+            return super().create(vals_list)
+
         # Execute original create
         records = super().create(vals_list)
         
-        # Trigger webhook with context flag to prevent duplicate write events
+        # Queue the create webhook for this transaction's precommit flush
         if records and not self.env.context.get('webhook_disabled'):
             try:
-                # Mark these records as "just created" to skip immediate writes
-                created_ids = set(records.ids)
-                
-                for record in records:
-                    if record.exists() and record.id:
-                        # Check debounce before triggering
-                        if self._webhook_should_trigger(record._name, record.id, 'create'):
-                            # Use context to prevent write webhook for this record
-                            record_with_ctx = record.with_context(
-                                _webhook_just_created=created_ids
-                            )
-                            self._webhook_trigger_create(record_with_ctx)
+                # New ids are unique, so creates are not debounced; writes
+                # later in the transaction are skipped via the created ids
+                records._webhook_defer_create()
             except Exception as e:
-                _logger.error(f'Webhook trigger failed for create: {e}', exc_info=True)
+                _logger.error('Webhook trigger failed for create: %s', e, exc_info=True)
         
         return records
 
@@ -86,31 +160,42 @@ class BaseWebhookHook(models.AbstractModel):
         Override write to trigger webhooks based on rules
         With debouncing to prevent multiple events for same record
         """
-        # Skip write events if we're in create context
-        if self.env.context.get('skip_webhook_write'):
+        # Fast path: untracked models pay a single set lookup
+        if not self._webhook_is_model_tracked():
+            return super().write(vals)
+
+        # Skip no-op writes, create context, and disabled webhooks
+        ctx_get = self.env.context.get
+        if not vals or ctx_get('skip_webhook_write') or ctx_get('webhook_disabled'):
             return super().write(vals)
         
         # Execute original write
         result = super().write(vals)
         
         # Trigger webhook (fail-safe) with debouncing
-        if not self.env.context.get('webhook_disabled'):
-            try:
-                # Get IDs of records that were just created (skip them)
-                just_created = self.env.context.get('_webhook_just_created', set())
-                
-                # Filter records:
-                # 1. Not just created (to avoid create+write duplicate)
-                # 2. Pass debounce check
-                records_to_trigger = self.filtered(
-                    lambda r: r.id not in just_created and 
-                              self._webhook_should_trigger(r._name, r.id, 'write')
-                )
-                
-                if records_to_trigger:
-                    records_to_trigger._webhook_trigger_write(vals)
-            except Exception as e:
-                _logger.error(f'Webhook trigger failed for write: {e}')
+        try:
+            # Get IDs of records that were just created (skip them): their
+            # create webhook is built at commit and already reflects this write
+            just_created = ctx_get('_webhook_just_created', ())
+            created = self.env.cr.precommit.data.get('webhook.created')
+            if created and self._name in created:
+                just_created = created[self._name].union(just_created)
+            
+            # Filter records:
+            # 1. Not just created (to avoid create+write duplicate)
+            # 2. Pass debounce check
+            model_name = self._name
+            should_trigger = self._webhook_should_trigger
+            records_to_trigger = self.browse([
+                record_id for record_id in self._ids
+                if record_id not in just_created
+                and should_trigger(model_name, record_id, 'write')
+            ])
+            
+            if records_to_trigger:
+                records_to_trigger._webhook_defer_write(vals)
+        except Exception as e:
+            _logger.error('Webhook trigger failed for write: %s', e)
         
         return result
 
@@ -118,12 +203,23 @@ class BaseWebhookHook(models.AbstractModel):
         """
         Override unlink to trigger webhooks based on rules
         """
+        # Fast path: untracked models pay a single set lookup
+        if not self._webhook_is_model_tracked():
+            return super().unlink()
+
+        # Resolve rules and config once for capture and trigger
+        if self.env.context.get('webhook_disabled'):
+            return super().unlink()
+        handlers = self._webhook_resolve_handlers('unlink')
+        if not handlers[0] and not handlers[1]:
+            return super().unlink()
+
         # Capture data before deletion
         records_data = []
         try:
-            records_data = self._webhook_capture_for_unlink()
+            records_data = self._webhook_capture_for_unlink(handlers)
         except Exception as e:
-            _logger.error(f'Failed to capture data for unlink webhook: {e}')
+            _logger.error('Failed to capture data for unlink webhook: %s', e)
         
         # Execute original unlink
         result = super().unlink()
@@ -132,7 +228,7 @@ class BaseWebhookHook(models.AbstractModel):
         try:
             self._webhook_trigger_unlink(records_data)
         except Exception as e:
-            _logger.error(f'Webhook trigger failed for unlink: {e}')
+            _logger.error('Webhook trigger failed for unlink: %s', e)
         
         return result
 
@@ -140,54 +236,150 @@ class BaseWebhookHook(models.AbstractModel):
     # Webhook Trigger Methods
     # ═══════════════════════════════════════════════════════════
 
-    def _webhook_trigger_create(self, record):
+    def _webhook_trigger_create(self, records):
         """
-        Trigger webhooks for created record
-        
+        Trigger webhooks for created records
+
         Supports both webhook.rule and webhook.config based tracking.
-        
+        Each rule's domain is evaluated once against the whole batch.
+
         Args:
-            record: Created record (single record)
+            records: Created records, browsed from persisted integer ids
         """
         # Early exit: Check if webhooks are disabled via context
         if self.env.context.get('webhook_disabled'):
             return
-        
+
         # Early exit: Check if this model is tracked
-        if not record._webhook_is_model_tracked():
+        if not records._webhook_is_model_tracked():
             return
-        
-        # Ensure record has valid ID
-        if not record.id or isinstance(record.id, models.NewId):
-            _logger.warning(
-                f'Skipping webhook for {record._name}: '
-                f'Record has no valid ID (id={record.id})'
-            )
-            return
-        
+
+        # Resolve rules and config once for the whole batch
+        rules, config = records._webhook_resolve_handlers('create')
+
         # Method 1: Try webhook.rule based triggering
-        rules = record._webhook_get_rules('create')
-        rules_triggered = False
-        
-        if rules:
-            for rule in rules:
-                try:
-                    # Check domain filter
-                    if not rule._match_domain(record):
-                        continue
-                    
-                    # Trigger event
-                    rule.trigger_event(record, 'create')
-                    rules_triggered = True
-                    
-                except Exception as e:
-                    _logger.error(
-                        f'Webhook trigger failed for rule "{rule.name}": {e}'
+        triggered_ids = records._webhook_apply_rules(rules, 'create')
+
+        # Method 2: Records no rule fired for fall back to webhook.config
+        if config:
+            for record in records:
+                if record.id not in triggered_ids:
+                    self._webhook_trigger_via_config(record, 'create', config=config)
+
+    def _webhook_apply_rules(self, rules, operation, vals=None):
+        """
+        Fire each rule once for the records of self matching its filters
+
+        Tracked fields are checked against vals and the domain is evaluated
+        in memory over the whole recordset with filtered_domain, so there is
+        no per-record loop.
+
+        Args:
+            rules: webhook.rule records for the operation
+            operation: Operation type ('create', 'write')
+            vals: Updated values (for write operation)
+
+        Returns:
+            set: IDs of records at least one rule fired for
+        """
+        triggered_ids = set()
+        for rule in rules:
+            try:
+                # Check tracked fields filter
+                if vals is not None and not rule._match_tracked_fields(vals):
+                    continue
+
+                # Check domain filter
+                domain = rule._get_parsed_domain()
+                matched = self.sudo().filtered_domain(domain).with_env(self.env) if domain else self
+                if not matched:
+                    continue
+
+                # Trigger events
+                rule.trigger_events(matched, operation, vals)
+                triggered_ids.update(matched.ids)
+
+            except Exception:
+                _logger.exception('Webhook trigger failed for rule "%s"', rule.name)
+        return triggered_ids
+
+    def _webhook_defer_create(self):
+        """
+        Queue created records for a single per-transaction trigger
+
+        Record ids are grouped per model (and user) on the cursor's precommit
+        data; one precommit hook is registered per transaction and fires
+        the create webhooks for each group in one pass.
+        """
+        precommit = self.env.cr.precommit
+        pending = precommit.data.get('webhook.create')
+        if pending is None:
+            pending = precommit.data['webhook.create'] = {}
+            precommit.add(self._webhook_flush_creates)
+        # Created ids per model, so writes in the same transaction are skipped
+        precommit.data.setdefault('webhook.created', {}).setdefault(
+            self._name, set()
+        ).update(self._ids)
+        key = (self._name, self.env.uid, self.env.su)
+        if key in pending:
+            pending[key][1].extend(self.ids)
+        else:
+            pending[key] = (self.env, list(self.ids))
+
+    @api.model
+    def _webhook_flush_creates(self):
+        """Trigger the create webhooks queued by _webhook_defer_create()"""
+        pending = self.env.cr.precommit.data.pop('webhook.create', None)
+        if not pending:
+            return
+        for (model_name, _uid, _su), (env, ids) in pending.items():
+            try:
+                # Records may have been deleted later in the transaction
+                records = env[model_name].browse(ids).exists()
+                if records:
+                    # Use context to prevent write webhook for these records
+                    env[model_name]._webhook_trigger_create(
+                        records.with_context(_webhook_just_created=set(ids))
                     )
-        
-        # Method 2: If no rules, try webhook.config based triggering
-        if not rules_triggered:
-            self._webhook_trigger_via_config(record, 'create')
+            except Exception as e:
+                _logger.error('Webhook trigger failed for create: %s', e, exc_info=True)
+        # Precommit hooks run after the ORM flush; flush what they created
+        self.env.flush_all()
+
+    def _webhook_defer_write(self, vals):
+        """
+        Queue updated records for the transaction's precommit flush
+
+        Each write is queued with its own vals (tracked-field filters and
+        _changed_fields depend on them); one precommit hook per transaction
+        triggers them in order.
+
+        Args:
+            vals: Updated values
+        """
+        precommit = self.env.cr.precommit
+        pending = precommit.data.get('webhook.write')
+        if pending is None:
+            pending = precommit.data['webhook.write'] = []
+            precommit.add(self._webhook_flush_writes)
+        pending.append((self.env, self._name, list(self.ids), dict(vals)))
+
+    @api.model
+    def _webhook_flush_writes(self):
+        """Trigger the write webhooks queued by _webhook_defer_write()"""
+        pending = self.env.cr.precommit.data.pop('webhook.write', None)
+        if not pending:
+            return
+        for env, model_name, ids, vals in pending:
+            try:
+                # Records may have been deleted later in the transaction
+                records = env[model_name].browse(ids).exists()
+                if records:
+                    records._webhook_trigger_write(vals)
+            except Exception as e:
+                _logger.error('Webhook trigger failed for write: %s', e, exc_info=True)
+        # Precommit hooks run after the ORM flush; flush what they created
+        self.env.flush_all()
 
     def _webhook_trigger_write(self, vals):
         """
@@ -198,6 +390,10 @@ class BaseWebhookHook(models.AbstractModel):
         Args:
             vals: Updated values
         """
+        # Early exit: nothing was written
+        if not vals:
+            return
+
         # Early exit: Check if webhooks are disabled via context
         if self.env.context.get('webhook_disabled'):
             return
@@ -206,69 +402,59 @@ class BaseWebhookHook(models.AbstractModel):
         if not self._webhook_is_model_tracked():
             return
         
+        # Resolve rules and config once for the whole batch
+        rules, config = self._webhook_resolve_handlers('write')
+
         # Method 1: Try webhook.rule based triggering
-        rules = self._webhook_get_rules('write')
-        rules_triggered = False
-        
-        if rules:
-            # Process each record
-            for record in self:
-                for rule in rules:
-                    try:
-                        # Check tracked fields filter
-                        if not rule._match_tracked_fields(vals):
-                            continue
-                        
-                        # Check domain filter
-                        if not rule._match_domain(record):
-                            continue
-                        
-                        # Trigger event
-                        rule.trigger_event(record, 'write', vals)
-                        rules_triggered = True
-                        
-                    except Exception as e:
-                        _logger.error(
-                            f'Webhook trigger failed for rule "{rule.name}": {e}'
-                        )
-        
-        # Method 2: If no rules, try webhook.config based triggering
-        if not rules_triggered:
+        triggered_ids = self._webhook_apply_rules(rules, 'write', vals)
+
+        # Method 2: Records no rule fired for fall back to webhook.config
+        if config:
             for record in self:
-                self._webhook_trigger_via_config(record, 'write', vals)
+                if record.id not in triggered_ids:
+                    self._webhook_trigger_via_config(record, 'write', vals, config=config)
 
-    def _webhook_capture_for_unlink(self):
+    def _webhook_resolve_handlers(self, operation):
+        """
+        Resolve the rules and config handling an operation on this model
+
+        Args:
+            operation: Operation type ('create', 'write', 'unlink')
+
+        Returns:
+            tuple: (webhook.rule records or _WH_NO_RULES,
+                    webhook.config enabling the operation or None)
+        """
+        rules = self._webhook_get_rules(operation)
+        config = self._webhook_config_for(self._name)
+        if config and operation not in config._get_cached_attrs()['events']:
+            config = None
+        return rules, config
+
+    def _webhook_capture_for_unlink(self, handlers=None):
         """
         Capture record data before deletion
         
         Supports both webhook.rule and webhook.config based tracking.
+
+        Args:
+            handlers: (rules, config) from _webhook_resolve_handlers('unlink'),
+                resolved here when not given
         
         Returns:
             list: List of dicts with record id and data
         """
-        # Early exit: Check if webhooks are disabled via context
-        if self.env.context.get('webhook_disabled'):
-            return []
-        
-        # Early exit: Check if this model is tracked
-        if not self._webhook_is_model_tracked():
-            return []
-        
-        # Get rules for this model and operation
-        rules = self._webhook_get_rules('unlink')
-        
-        # Also check for webhook.config
-        config = None
-        if 'webhook.config' in self.env:
-            config = self.env['webhook.config'].sudo().search([
-                ('model_name', '=', self._name),
-                ('enabled', '=', True),
-                ('active', '=', True)
-            ], limit=1)
-            
-            # If config exists, check if unlink is enabled
-            if config and 'unlink' not in config.events.split(','):
-                config = None
+        if handlers is None:
+            # Early exit: Check if webhooks are disabled via context
+            if self.env.context.get('webhook_disabled'):
+                return []
+
+            # Early exit: Check if this model is tracked
+            if not self._webhook_is_model_tracked():
+                return []
+
+            handlers = self._webhook_resolve_handlers('unlink')
+        rules, config = handlers
         
         # Exit if no rules and no config
         if not rules and not config:
@@ -276,16 +462,36 @@ class BaseWebhookHook(models.AbstractModel):
         
         # Capture data for each record
         records_data = []
-        for record in self:
+        if rules:
+            # Use first rule's payload preparation, one read() for the batch
             try:
-                # Prepare payload
-                if rules:
-                    # Use first rule's payload preparation
-                    payload = rules[0]._prepare_payload(record)
-                else:
+                payloads = rules[0]._prepare_payloads(self)
+            except Exception as e:
+                _logger.error('Failed to capture unlink data: %s', e)
+                return []
+        elif len(self) == 1:
+            # Common UI case: single-record delete, no per-record loop
+            try:
+                payload = self._webhook_prepare_payload(self, 'unlink', config=config)
+            except Exception as e:
+                _logger.error('Failed to capture unlink data: %s', e)
+                return []
+            return [{
+                'id': self.id,
+                'model': self._name,
+                'payload': payload,
+                'rules': rules,
+                'config': config,
+            }]
+        else:
+            payloads = [None] * len(self)
+
+        for record, payload in zip(self, payloads):
+            try:
+                if not rules:
                     # Use config-based payload preparation
                     payload = self._webhook_prepare_payload(record, 'unlink', config=config)
-                
+
                 records_data.append({
                     'id': record.id,
                     'model': record._name,
@@ -294,7 +500,7 @@ class BaseWebhookHook(models.AbstractModel):
                     'config': config,
                 })
             except Exception as e:
-                _logger.error(f'Failed to capture unlink data: {e}')
+                _logger.error('Failed to capture unlink data: %s', e)
         
         return records_data
 
@@ -309,46 +515,47 @@ class BaseWebhookHook(models.AbstractModel):
         """
         if not records_data:
             return
-        
+
+        # Method 1: webhook.rule based triggering, one multi-row insert
+        events_data = []
+        touched_rules = self.env['webhook.rule']
+        configs = {}
         for data in records_data:
-            rules = data.get('rules', [])
-            rules_triggered = False
-            
-            # Method 1: Try webhook.rule based triggering
-            for rule in rules:
-                try:
-                    # Get webhook config for additional metadata
-                    config = self.env['webhook.config'].sudo().search([
-                        ('model_name', '=', data['model'])
-                    ], limit=1)
-                    
-                    # Create event using update.webhook.create_event
-                    self.env['update.webhook'].sudo().create_event(
-                        model_name=data['model'],
-                        record_id=data['id'],
-                        event_type='unlink',
-                        payload_data=data['payload'],
-                        config=config if config else None
-                    )
-                    
-                    # Update rule last trigger
-                    rule.sudo().write({'last_trigger': fields.Datetime.now()})
-                    
-                    rules_triggered = True
-                    
-                    _logger.debug(
-                        f'Unlink webhook event created: '
-                        f'{data["model"]}:{data["id"]}'
-                    )
-                    
-                except Exception as e:
-                    _logger.error(
-                        f'Webhook trigger failed for unlink: {e}'
-                    )
-            
-            # Method 2: If no rules, try webhook.config based triggering
-            if not rules_triggered:
+            rules = data.get('rules')
+            if not rules:
+                # Method 2: If no rules, try webhook.config based triggering
                 self._webhook_trigger_unlink_via_config(data)
+                continue
+
+            model_name = data['model']
+            if model_name not in configs:
+                # Get webhook config for additional metadata, reusing the
+                # one resolved at capture time
+                configs[model_name] = data.get('config') or self.env['webhook.config'].sudo().search([
+                    ('model_name', '=', model_name)
+                ], limit=1)
+
+            for rule in rules:
+                events_data.append({
+                    'model': model_name,
+                    'record_id': data['id'],
+                    'event_type': 'unlink',
+                    'payload': data['payload'],
+                    'config': configs[model_name],
+                })
+                touched_rules |= rule
+
+        if events_data:
+            try:
+                # Create events using update.webhook.create_bulk_events
+                self.env['update.webhook'].sudo().create_bulk_events(events_data)
+
+                # Update rule last trigger
+                touched_rules.sudo().write({'last_trigger': fields.Datetime.now()})
+
+                _logger.debug('Unlink webhook events created: %s', len(events_data))
+            except Exception as e:
+                _logger.error('Webhook trigger failed for unlink: %s', e)
 
     # ═══════════════════════════════════════════════════════════
     # Helper Methods
@@ -365,8 +572,10 @@ class BaseWebhookHook(models.AbstractModel):
         
         Special rules:
         - 'create' and 'write' share the same debounce window
-          (because Odoo often does create() then write() immediately)
         - 'unlink' has its own debounce window
+
+        create() does not call this: writes following a create in the same
+        transaction are skipped by id (see _webhook_defer_create()).
         
         Args:
             model_name: Technical model name
@@ -379,81 +588,169 @@ class BaseWebhookHook(models.AbstractModel):
         # Create and Write share same debounce key
         # This prevents write() right after create() from triggering
         if operation in ('create', 'write'):
-            cache_key = f"{model_name}:{record_id}:create_write"
+            cache_key = (model_name, record_id, 'create_write')
         else:
-            cache_key = f"{model_name}:{record_id}:{operation}"
-        
-        current_time = time.time()
-        
-        with cls._webhook_debounce_lock:
-            # Clean old entries (older than 60 seconds)
-            keys_to_delete = [
-                k for k, v in cls._webhook_debounce_cache.items()
-                if current_time - v > 60
-            ]
-            for k in keys_to_delete:
-                del cls._webhook_debounce_cache[k]
-            
+            cache_key = (model_name, record_id, operation)
+
+        current_time = time.monotonic()
+
+        # Lock-free fast path: repeated writes on a record usually come from
+        # the thread that just triggered it (computed and related fields)
+        tls = cls._webhook_debounce_tls
+        last = getattr(tls, 'last', None)
+        if last is not None and last[0] == cache_key and current_time - last[1] < cls._DEBOUNCE_SECONDS:
+            return False
+
+        shard_index = hash(cache_key) & (cls._DEBOUNCE_SHARDS - 1)
+        shard = cls._webhook_debounce_shards[shard_index]
+
+        # Only this shard is locked: other records debounce concurrently
+        with cls._webhook_debounce_locks[shard_index]:
+            # Expire entries past the debounce window; they are the oldest
+            while shard:
+                oldest_key, oldest_time = next(iter(shard.items()))
+                if current_time - oldest_time < cls._DEBOUNCE_SECONDS:
+                    break
+                del shard[oldest_key]
+
             # Check if recently triggered (any operation on same record)
-            last_trigger = cls._webhook_debounce_cache.get(cache_key, 0)
-            
-            if current_time - last_trigger < cls._DEBOUNCE_SECONDS:
+            last_trigger = shard.get(cache_key)
+
+            if last_trigger is not None and current_time - last_trigger < cls._DEBOUNCE_SECONDS:
                 _logger.debug(
-                    f'Webhook debounced for {cache_key} '
-                    f'(triggered {current_time - last_trigger:.2f}s ago)'
+                    'Webhook debounced for %s (triggered %.2fs ago)',
+                    cache_key, current_time - last_trigger
                 )
                 return False
-            
+
             # Update cache and allow trigger
-            cls._webhook_debounce_cache[cache_key] = current_time
-            return True
+            shard[cache_key] = current_time
+            shard.move_to_end(cache_key)
+            if len(shard) > cls._DEBOUNCE_SHARD_SIZE:
+                shard.popitem(last=False)
+        tls.last = (cache_key, current_time)
+        return True
 
     def _webhook_is_model_tracked(self):
         """
         Fast check if current model has any webhook rules OR webhook config
-        
-        Uses cached set of tracked models for O(1) lookup.
-        Also checks webhook.config for manually added models.
-        
+
+        Excluded models return before the tracked-models state is touched,
+        so webhook's own tables never trigger a state load; everything else
+        is an O(1) lookup in the cached frozenset.
+
         Returns:
             bool: True if model is tracked
         """
-        try:
-            # Handle special cases
-            if not hasattr(self, '_name') or not self._name:
-                return False
-            
-            # Skip internal/technical models EXCEPT res.partner
-            if self._name.startswith('ir.'):
-                return False
-            
-            if self._name in ['webhook.rule', 'webhook.event', 'update.webhook',
-                              'webhook.config', 'webhook.subscriber', 'webhook.audit',
-                              'webhook.retry', 'webhook.template', 'user.sync.state',
-                              'webhook.errors', 'webhook.cleanup.cron']:
-                return False
-            
-            # Check 1: webhook.rule (rules-based tracking)
-            if 'webhook.rule' in self.env:
-                tracked_models = self.env['webhook.rule']._get_tracked_models()
-                if self._name in tracked_models:
-                    return True
-            
-            # Check 2: webhook.config (config-based tracking for manually added models)
-            if 'webhook.config' in self.env:
-                config = self.env['webhook.config'].sudo().search([
-                    ('model_name', '=', self._name),
-                    ('enabled', '=', True),
-                    ('active', '=', True)
-                ], limit=1)
-                if config:
-                    return True
-            
+        name = self._name
+        if name.startswith(_WH_EXCLUDED_PREFIXES) or name in _WH_EXCLUDED_MODELS:
             return False
-            
+        return name in self._webhook_tracked_models()
+
+    @api.model
+    def _webhook_tracked_models(self):
+        """
+        Names of all models with an active webhook.rule or webhook.config,
+        minus the technical, webhook, transient and abstract models that are
+        never tracked
+
+        Returns:
+            frozenset: Tracked model names
+        """
+        return self._webhook_tracking_state()[0]
+
+    @api.model
+    def _webhook_config_for(self, model_name):
+        """
+        Enabled, active webhook.config for a model, from the cached map
+
+        Args:
+            model_name: Technical model name
+
+        Returns:
+            webhook.config record (sudo), or None
+        """
+        config_id = self._webhook_tracking_state()[1].get(model_name)
+        if not config_id:
+            return None
+        return self.env['webhook.config'].sudo().browse(config_id)
+
+    @api.model
+    def _webhook_tracking_state(self):
+        """
+        Tracked model names and the {model_name: config_id} map
+
+        Served from _webhook_tracking_state_cached(); if loading fails, an
+        empty state is returned and nothing is cached, so the next call
+        retries.
+
+        Returns:
+            tuple: (frozenset of tracked models, {model_name: config_id})
+        """
+        try:
+            return self.env['base']._webhook_tracking_state_cached()
         except Exception as e:
-            _logger.debug(f'Error checking if model is tracked: {e}')
-            return False
+            _logger.debug('Error loading tracked models: %s', e)
+            return (frozenset(), {})
+
+    @api.model
+    @tools.ormcache()
+    def _webhook_tracking_state_cached(self):
+        """
+        Build the tracked-models state (always called on the 'base' model)
+
+        An ormcache entry, so _webhook_invalidate_caches() drops it in every
+        worker through the registry's cache signaling.
+
+        Returns:
+            tuple: (frozenset of tracked models, {model_name: config_id})
+        """
+        tracked = set()
+        config_map = {}
+        # webhook.rule (rules-based tracking)
+        if 'webhook.rule' in self.env:
+            tracked.update(self.env['webhook.rule']._get_tracked_models())
+        # webhook.config (config-based tracking for manually added models)
+        if 'webhook.config' in self.env:
+            configs = self.env['webhook.config'].sudo().search_read([
+                ('enabled', '=', True),
+                ('active', '=', True)
+            ], ['model_name'])
+            # First config in _order wins, as with search(limit=1)
+            for config in configs:
+                config_map.setdefault(config['model_name'], config['id'])
+            tracked.update(config_map)
+
+        registry_models = self.pool.models
+        tracked = frozenset(
+            name for name in tracked
+            if name and not name.startswith(_WH_EXCLUDED_PREFIXES)
+            and name not in _WH_EXCLUDED_MODELS
+            # Wizards and abstract models have no persistent records
+            and name in registry_models
+            and not registry_models[name]._transient
+            and not registry_models[name]._abstract
+        )
+        return (tracked, config_map)
+
+    @api.model
+    def _webhook_invalidate_caches(self):
+        """
+        Invalidate the webhook lookup caches after rules, configs or
+        subscribers change
+
+        The caches are ormcache entries: clearing the registry cache also
+        signals the other workers. They are cleared right away, so this
+        transaction sees its own change, and again when it commits or rolls
+        back, so nothing rebuilt from uncommitted data meanwhile survives.
+        """
+        registry = self.env.registry
+        _webhook_clear_registry_cache(registry)
+        cr = self.env.cr
+        if not cr.postcommit.data.get('webhook.invalidate_caches'):
+            cr.postcommit.data['webhook.invalidate_caches'] = True
+            cr.postcommit.add(lambda: _webhook_clear_registry_cache(registry))
+            cr.postrollback.add(lambda: _webhook_clear_registry_cache(registry))
 
     def _webhook_get_rules(self, operation):
         """
@@ -463,15 +760,18 @@ class BaseWebhookHook(models.AbstractModel):
             operation: Operation type ('create', 'write', 'unlink')
             
         Returns:
-            recordset: webhook.rule records
+            recordset: webhook.rule records, or the shared empty _WH_NO_RULES
         """
         try:
-            return self.env['webhook.rule']._get_rules_for(self._name, operation)
+            rule_ids = self.env['webhook.rule']._get_rule_maps()[operation].get(self._name)
         except Exception as e:
-            _logger.error(f'Failed to get webhook rules: {e}')
-            return self.env['webhook.rule'].browse()
+            _logger.error('Failed to get webhook rules: %s', e)
+            return _WH_NO_RULES
+        if not rule_ids:
+            return _WH_NO_RULES
+        return self.env['webhook.rule'].sudo().browse(rule_ids)
 
-    def _webhook_trigger_via_config(self, record, operation, vals=None):
+    def _webhook_trigger_via_config(self, record, operation, vals=None, config=None):
         """
         Trigger webhook via webhook.config (for manually added models)
         
@@ -482,45 +782,34 @@ class BaseWebhookHook(models.AbstractModel):
             record: The record that triggered the event
             operation: Operation type ('create', 'write', 'unlink')
             vals: Changed values (for write operation)
+            config: webhook.config already resolved by the caller (optional)
         """
         try:
             # Get webhook config
-            if 'webhook.config' not in self.env:
-                return
-            
-            config = self.env['webhook.config'].sudo().search([
-                ('model_name', '=', record._name),
-                ('enabled', '=', True),
-                ('active', '=', True)
-            ], limit=1)
-            
+            if config is None:
+                config = self._webhook_config_for(record._name)
             if not config:
                 return
             
             # Check if this event type is enabled
-            if operation not in config.events.split(','):
+            attrs = config._get_cached_attrs()
+            if operation not in attrs['events']:
                 return
             
-            # Check filter domain
-            if config.filter_domain:
+            # Check filtered fields for write events (cheapest filter first)
+            if operation == 'write' and vals:
+                tracked_field_names = attrs['filtered_fields']
+                if tracked_field_names and tracked_field_names.isdisjoint(vals):
+                    return
+
+            # Check filter domain in memory (parsed once per config)
+            domain = attrs['domain']
+            if domain:
                 try:
-                    from odoo.tools.safe_eval import safe_eval
-                    domain = safe_eval(config.filter_domain)
-                    if domain:
-                        matching = record.sudo().search([
-                            ('id', '=', record.id)
-                        ] + domain, limit=1)
-                        if not matching:
-                            return
+                    if not record.sudo().filtered_domain(domain):
+                        return
                 except Exception as e:
-                    _logger.warning(f'Domain filter error: {e}')
-            
-            # Check filtered fields for write events
-            if operation == 'write' and config.filtered_fields and vals:
-                tracked_field_names = set(config.filtered_fields.mapped('name'))
-                changed_fields = set(vals.keys())
-                if not tracked_field_names.intersection(changed_fields):
-                    return
+                    _logger.warning('Domain filter error: %s', e)
             
             # Prepare payload data
             payload_data = self._webhook_prepare_payload(record, operation, vals, config)
@@ -534,47 +823,170 @@ class BaseWebhookHook(models.AbstractModel):
                     payload_data=payload_data,
                     config=config
                 )
-                _logger.debug(f'Created update.webhook event: {record._name}:{record.id} ({operation})')
+                _logger.debug('Created update.webhook event: %s:%s (%s)', record._name, record.id, operation)
             except Exception as e:
-                _logger.error(f'Failed to create update.webhook event: {e}')
+                _logger.error('Failed to create update.webhook event: %s', e)
             
             # Step 2: Create webhook.event for subscribers (for push-based delivery)
-            subscribers = config.subscribers.filtered(lambda s: s.enabled and s.active)
+            subscribers = self.env['webhook.subscriber'].sudo().browse(
+                attrs['subscriber_ids']
+            )
             if subscribers and config.instant_send:
-                for subscriber in subscribers:
-                    try:
-                        event = self.env['webhook.event'].sudo().create({
-                            'model': record._name,
-                            'record_id': record.id,
-                            'event': operation,
-                            'config_id': config.id,
-                            'subscriber_id': subscriber.id,
-                            'priority': config.priority,
-                            'category': config.category,
-                            'payload': payload_data,
-                            'status': 'pending',
-                            'changed_fields': list(vals.keys()) if vals else [],
-                        })
-                        
-                        _logger.info(f'Created webhook.event: {event.id} for {record._name}:{record.id}')
-                        
-                        # Instant send for high priority (after transaction commits)
-                        if config.instant_send and config.priority == 'high':
-                            event_id = event.id
-                            def send_after_commit(ev_id=event_id):
-                                try:
-                                    ev = self.env['webhook.event'].sudo().browse(ev_id)
-                                    if ev.exists() and ev.status == 'pending':
-                                        ev._send_to_subscriber()
-                                except Exception as e:
-                                    _logger.error(f'Instant send failed: {e}')
-                            self.env.cr.postcommit.add(send_after_commit)
-                                
-                    except Exception as e:
-                        _logger.error(f'Failed to create webhook.event for {subscriber.name}: {e}')
-                        
+                changed_fields = list(vals.keys()) if vals else []
+                self._webhook_create_subscriber_events(config, [{
+                    'model': record._name,
+                    'record_id': record.id,
+                    'event': operation,
+                    'config_id': config.id,
+                    'subscriber_id': subscriber.id,
+                    'priority': config.priority,
+                    'category': config.category,
+                    'payload': payload_data,
+                    'status': 'pending',
+                    'changed_fields': changed_fields,
+                } for subscriber in subscribers])
+
         except Exception as e:
-            _logger.error(f'Webhook trigger via config failed: {e}', exc_info=True)
+            _logger.error('Webhook trigger via config failed: %s', e, exc_info=True)
+
+    @api.model
+    def _webhook_field_plan(self, record, config=None):
+        """
+        Fields a config payload includes, with their type codes
+
+        Built once per (model, config) by _webhook_field_plan_cached().
+
+        Args:
+            record: Record (or model) the payload is built for
+            config: webhook.config record, or None
+
+        Returns:
+            tuple: (field_name, _WH_FIELD_* code) pairs in payload order
+        """
+        return self.env['base']._webhook_field_plan_cached(
+            record._name, config.id if config else None
+        )
+
+    @api.model
+    @tools.ormcache('model_name', 'config_id')
+    def _webhook_field_plan_cached(self, model_name, config_id):
+        """
+        Build the field plan of a model and config (called on 'base')
+
+        Args:
+            model_name: Technical model name
+            config_id: webhook.config ID, or None
+
+        Returns:
+            tuple: (field_name, _WH_FIELD_* code) pairs in payload order
+        """
+        config = self.env['webhook.config'].sudo().browse(config_id) if config_id else None
+        field_names = None
+        if config and config.filtered_fields:
+            field_names = config.filtered_fields.mapped('name')
+        return _webhook_build_field_plan(self.env[model_name]._fields, field_names)
+
+    def _webhook_read_payload(self, record, plan):
+        """
+        Build payload field values with a single read()
+
+        Args:
+            record: The record
+            plan: (field_name, type code) pairs from _webhook_field_plan()
+
+        Returns:
+            dict: Payload field values
+        """
+        return self._webhook_read_payloads(record, plan)[0]
+
+    def _webhook_read_payloads(self, records, plan):
+        """
+        Build payload field values for a batch of records with one read()
+
+        Args:
+            records: Records of a single model
+            plan: (field_name, type code) pairs from _webhook_field_plan()
+
+        Returns:
+            list: Payload field value dicts, in the order of records
+        """
+        if not plan:
+            return [{} for _record in records]
+        rows = records.with_context(bin_size=True).read([name for name, _code in plan])
+        # read() may drop or reorder ids, so match rows back by id
+        rows_by_id = {row['id']: row for row in rows}
+        payloads = []
+        for record in records:
+            raw = rows_by_id.get(record.id, {})
+            data = {}
+            for field_name, code in plan:
+                value = raw.get(field_name)
+                if code == _WH_FIELD_M2O:
+                    # read() returns (id, display_name) or False
+                    data[field_name] = {
+                        'id': value[0] if value else False,
+                        'name': value[1] if value else ''
+                    }
+                elif code == _WH_FIELD_X2M:
+                    # read() returns ids; name the first 50 in one read()
+                    comodel = records._fields[field_name].comodel_name
+                    data[field_name] = [
+                        {'id': r['id'], 'name': r['display_name']}
+                        for r in self.env[comodel].browse(value[:50]).read(['display_name'])
+                    ] if value else []
+                elif code == _WH_FIELD_TEMPORAL:
+                    data[field_name] = value.isoformat() if value else False
+                elif code == _WH_FIELD_BINARY:
+                    data[field_name] = bool(value)
+                else:
+                    data[field_name] = value
+            payloads.append(data)
+        return payloads
+
+    def _webhook_getattr_payload(self, record, plan):
+        """
+        Build payload field values one field at a time
+
+        Fallback for _webhook_read_payload(): a field that fails to load
+        is reported as None instead of failing the whole payload.
+
+        Args:
+            record: The record
+            plan: (field_name, type code) pairs from _webhook_field_plan()
+
+        Returns:
+            dict: Payload field values
+        """
+        data = {}
+        for field_name, code in plan:
+            try:
+                # Binary fields only report whether they are set
+                if code == _WH_FIELD_BINARY:
+                    data[field_name] = bool(getattr(record, field_name, None))
+                    continue
+
+                value = getattr(record, field_name, None)
+
+                # Handle field types
+                if code == _WH_FIELD_M2O:
+                    data[field_name] = {
+                        'id': value.id if value else False,
+                        'name': value.display_name if value else ''
+                    }
+                elif code == _WH_FIELD_X2M:
+                    data[field_name] = [
+                        {'id': r.id, 'name': r.display_name}
+                        for r in (value[:50] if value else [])
+                    ]
+                elif code == _WH_FIELD_TEMPORAL:
+                    data[field_name] = value.isoformat() if value else False
+                else:
+                    data[field_name] = value
+
+            except Exception as e:
+                _logger.warning('Failed to get field %s: %s', field_name, e)
+                data[field_name] = None
+        return data
 
     def _webhook_prepare_payload(self, record, operation, vals=None, config=None):
         """
@@ -590,60 +1002,14 @@ class BaseWebhookHook(models.AbstractModel):
             dict: Payload data
         """
         try:
-            # Get fields to include
-            if config and config.filtered_fields:
-                fields_to_include = config.filtered_fields.mapped('name')
-            else:
-                # All readable fields (excluding internal ones)
-                fields_to_include = [
-                    f for f in record._fields.keys()
-                    if not f.startswith('_') and f not in [
-                        'create_uid', 'write_uid', '__last_update',
-                        'message_ids', 'message_follower_ids', 'activity_ids'
-                    ]
-                ]
-            
-            # Build data
-            data = {}
-            for field_name in fields_to_include:
-                try:
-                    field = record._fields.get(field_name)
-                    if not field:
-                        continue
-                    
-                    # Skip computed non-stored fields
-                    if field.compute and not field.store:
-                        continue
-                    
-                    # Skip binary fields
-                    if field.type == 'binary':
-                        data[field_name] = bool(getattr(record, field_name, None))
-                        continue
-                    
-                    value = getattr(record, field_name, None)
-                    
-                    # Handle field types
-                    if field.type == 'many2one':
-                        data[field_name] = {
-                            'id': value.id if value else False,
-                            'name': value.display_name if value else ''
-                        }
-                    elif field.type in ['one2many', 'many2many']:
-                        data[field_name] = [
-                            {'id': r.id, 'name': r.display_name}
-                            for r in (value[:50] if value else [])
-                        ]
-                    elif field.type == 'datetime':
-                        data[field_name] = value.isoformat() if value else False
-                    elif field.type == 'date':
-                        data[field_name] = value.isoformat() if value else False
-                    else:
-                        data[field_name] = value
-                        
-                except Exception as e:
-                    _logger.warning(f'Failed to get field {field_name}: {e}')
-                    data[field_name] = None
-            
+            plan = self._webhook_field_plan(record, config)
+            try:
+                # One read() for all fields instead of a getattr per field
+                data = self._webhook_read_payload(record, plan)
+            except Exception as e:
+                _logger.debug('Batched payload read failed for %s: %s', record, e)
+                data = self._webhook_getattr_payload(record, plan)
+
             # Add metadata
             data['_metadata'] = {
                 'model': record._name,
@@ -660,7 +1026,7 @@ class BaseWebhookHook(models.AbstractModel):
             return data
             
         except Exception as e:
-            _logger.error(f'Failed to prepare payload: {e}')
+            _logger.error('Failed to prepare payload: %s', e)
             return {
                 '_metadata': {
                     'model': record._name,
@@ -681,20 +1047,14 @@ class BaseWebhookHook(models.AbstractModel):
             config = data.get('config')
             if not config:
                 # Try to get config
-                if 'webhook.config' not in self.env:
-                    return
-                
-                config = self.env['webhook.config'].sudo().search([
-                    ('model_name', '=', data['model']),
-                    ('enabled', '=', True),
-                    ('active', '=', True)
-                ], limit=1)
+                config = self._webhook_config_for(data['model'])
             
             if not config:
                 return
             
             # Check if unlink is enabled
-            if 'unlink' not in config.events.split(','):
+            attrs = config._get_cached_attrs()
+            if 'unlink' not in attrs['events']:
                 return
             
             # Step 1: Create event in update.webhook
@@ -706,43 +1066,62 @@ class BaseWebhookHook(models.AbstractModel):
                     payload_data=data['payload'],
                     config=config
                 )
-                _logger.debug(f'Created update.webhook unlink event: {data["model"]}:{data["id"]}')
+                _logger.debug('Created update.webhook unlink event: %s:%s', data['model'], data['id'])
             except Exception as e:
-                _logger.error(f'Failed to create update.webhook unlink event: {e}')
+                _logger.error('Failed to create update.webhook unlink event: %s', e)
             
             # Step 2: Create webhook.event for subscribers
-            subscribers = config.subscribers.filtered(lambda s: s.enabled and s.active)
+            subscribers = self.env['webhook.subscriber'].sudo().browse(
+                attrs['subscriber_ids']
+            )
             if subscribers and config.instant_send:
-                for subscriber in subscribers:
+                self._webhook_create_subscriber_events(config, [{
+                    'model': data['model'],
+                    'record_id': data['id'],
+                    'event': 'unlink',
+                    'config_id': config.id,
+                    'subscriber_id': subscriber.id,
+                    'priority': config.priority,
+                    'category': config.category,
+                    'payload': data['payload'],
+                    'status': 'pending',
+                } for subscriber in subscribers])
+
+        except Exception as e:
+            _logger.error('Unlink webhook via config failed: %s', e, exc_info=True)
+
+    def _webhook_create_subscriber_events(self, config, vals_list):
+        """
+        Create the webhook.event rows for a config's subscribers at once
+
+        High priority events are sent after the transaction commits.
+
+        Args:
+            config: webhook.config the events belong to
+            vals_list: One webhook.event vals dict per subscriber
+
+        Returns:
+            webhook.event recordset (empty on failure)
+        """
+        WebhookEvent = self.env['webhook.event'].sudo()
+        try:
+            events = WebhookEvent.create(vals_list)
+        except Exception as e:
+            _logger.error('Failed to create webhook.event for config %s: %s', config.name, e)
+            return WebhookEvent
+
+        _logger.info('Created webhook.event(s): %s', events.ids)
+
+        # Instant send for high priority (after transaction commits)
+        if config.priority == 'high':
+            event_ids = events.ids
+
+            def send_after_commit():
+                for ev in WebhookEvent.browse(event_ids).exists():
                     try:
-                        event = self.env['webhook.event'].sudo().create({
-                            'model': data['model'],
-                            'record_id': data['id'],
-                            'event': 'unlink',
-                            'config_id': config.id,
-                            'subscriber_id': subscriber.id,
-                            'priority': config.priority,
-                            'category': config.category,
-                            'payload': data['payload'],
-                            'status': 'pending',
-                        })
-                        
-                        _logger.info(f'Created webhook.event for unlink: {event.id}')
-                        
-                        # Instant send for high priority (after transaction commits)
-                        if config.priority == 'high':
-                            event_id = event.id
-                            def send_unlink_after_commit(ev_id=event_id):
-                                try:
-                                    ev = self.env['webhook.event'].sudo().browse(ev_id)
-                                    if ev.exists() and ev.status == 'pending':
-                                        ev._send_to_subscriber()
-                                except Exception as e:
-                                    _logger.error(f'Instant send failed: {e}')
-                            self.env.cr.postcommit.add(send_unlink_after_commit)
-                                
+                        if ev.status == 'pending':
+                            ev._send_to_subscriber()
                     except Exception as e:
-                        _logger.error(f'Failed to create unlink webhook.event: {e}')
-                        
-        except Exception as e:
-            _logger.error(f'Unlink webhook via config failed: {e}', exc_info=True)
+                        _logger.error('Instant send failed: %s', e)
+            self.env.cr.postcommit.add(send_after_commit)
+        return events
@@ -6,111 +6,41 @@ import logging
 _logger = logging.getLogger(__name__)
 
 
-class SaleOrder(models.Model):
-    """طلبات المبيعات"""
-    _name = 'sale.order'
-    _inherit = ['sale.order', 'webhook.mixin']
-    _description = 'Sales Order with Webhook Tracking'
-
-
-class ProductTemplate(models.Model):
-    """قوالب المنتجات"""
-    _name = 'product.template'
-    _inherit = ['product.template', 'webhook.mixin']
-    _description = 'Product Template with Webhook Tracking'
-
-
-class ProductCategory(models.Model):
-    """فئات المنتجات"""
-    _name = 'product.category'
-    _inherit = ['product.category', 'webhook.mixin']
-    _description = 'Product Category with Webhook Tracking'
-
-
-class ResPartner(models.Model):
-    """العملاء والموردين"""
-    _name = 'res.partner'
-    _inherit = ['res.partner', 'webhook.mixin']
-    _description = 'Partner with Webhook Tracking'
-
-
-class AccountMove(models.Model):
-    """الفواتير والقيود المحاسبية"""
-    _name = 'account.move'
-    _inherit = ['account.move', 'webhook.mixin']
-    _description = 'Account Move with Webhook Tracking'
-
-
-class AccountJournal(models.Model):
-    """دفاتر اليومية"""
-    _name = 'account.journal'
-    _inherit = ['account.journal', 'webhook.mixin']
-    _description = 'Account Journal with Webhook Tracking'
-
-
-class HrExpense(models.Model):
-    """مصروفات الموظفين"""
-    _name = 'hr.expense'
-    _inherit = ['hr.expense', 'webhook.mixin']
-    _description = 'HR Expense with Webhook Tracking'
-
-
-class StockPicking(models.Model):
-    """عمليات النقل والمخزون"""
-    _name = 'stock.picking'
-    _inherit = ['stock.picking', 'webhook.mixin']
-    _description = 'Stock Picking with Webhook Tracking'
-
-
-class PurchaseOrder(models.Model):
-    """طلبات الشراء"""
-    _name = 'purchase.order'
-    _inherit = ['purchase.order', 'webhook.mixin']
-    _description = 'Purchase Order with Webhook Tracking'
-
-
-class HrEmployee(models.Model):
-    """الموظفين"""
-    _name = 'hr.employee'
-    _inherit = ['hr.employee', 'webhook.mixin']
-    _description = 'HR Employee with Webhook Tracking'
-
+# النماذج المتتبعة عبر webhook.mixin
+TRACKED_MODELS = [
+    'sale.order',          # طلبات المبيعات
+    'product.template',    # قوالب المنتجات
+    'product.category',    # فئات المنتجات
+    'res.partner',         # العملاء والموردين
+    'account.move',        # الفواتير والقيود المحاسبية
+    'account.journal',     # دفاتر اليومية
+    'hr.expense',          # مصروفات الموظفين
+    'stock.picking',       # عمليات النقل والمخزون
+    'purchase.order',      # طلبات الشراء
+    'hr.employee',         # الموظفين
+    'stock.move',          # حركات المخزون
+    'account.payment',     # المدفوعات
+]
 
 # ===== نماذج إضافية (اختيارية - يتم تفعيلها فقط إذا كانت موجودة) =====
 # هذه النماذج قد لا تكون متوفرة في جميع قواعد البيانات
-# يمكن إلغاء التعليق عنها إذا كانت الموديلات المطلوبة مثبتة
-
-class StockMove(models.Model):
-    """حركات المخزون"""
-    _name = 'stock.move'
-    _inherit = ['stock.move', 'webhook.mixin']
-    _description = 'Stock Move with Webhook Tracking'
-
-
-class AccountPayment(models.Model):
-    """المدفوعات"""
-    _name = 'account.payment'
-    _inherit = ['account.payment', 'webhook.mixin']
-    _description = 'Account Payment with Webhook Tracking'
-
-
-# class CrmLead(models.Model):
-#     """الفرص التجارية"""
-#     _name = 'crm.lead'
-#     _inherit = ['crm.lead', 'webhook.mixin']
-#     _description = 'CRM Lead with Webhook Tracking'
-# Note: Uncomment if crm module is installed
-
-
-# class ProjectTask(models.Model):
-#     """مهام المشاريع"""
-#     _name = 'project.task'
-#     _inherit = ['project.task', 'webhook.mixin']
-#     _description = 'Project Task with Webhook Tracking'
-
-
-# class HrAttendance(models.Model):
-#     """الحضور والانصراف"""
-#     _name = 'hr.attendance'
-#     _inherit = ['hr.attendance', 'webhook.mixin']
-#     _description = 'HR Attendance with Webhook Tracking'
\ No newline at end of file
+# يمكن إضافتها إلى TRACKED_MODELS إذا كانت الموديلات المطلوبة مثبتة:
+#   'crm.lead'        - الفرص التجارية (crm)
+#   'project.task'    - مهام المشاريع (project)
+#   'hr.attendance'   - الحضور والانصراف (hr_attendance)
+
+
+# One inheriting class per model (SaleOrder, ProductTemplate, ...); Odoo
+# registers each class when it is created, so no class body is needed
+for _model_name in TRACKED_MODELS:
+    _cls = type(
+        ''.join(part.title() for part in _model_name.split('.')),
+        (models.Model,),
+        {
+            '_name': _model_name,
+            '_inherit': [_model_name, 'webhook.mixin'],
+        },
+    )
+    globals()[_cls.__name__] = _cls
+
+del _model_name, _cls
@@ -1,9 +1,17 @@
 from odoo import models, fields, api # type: ignore
 import logging
+from collections import defaultdict
 from datetime import timedelta
 
 _logger = logging.getLogger(__name__)
 
+# Events of one model whose record is gone; {table} is a model's _table
+SQL_DELETE_ORPHANS = """
+    DELETE FROM update_webhook w
+    WHERE w.model = %s
+      AND NOT EXISTS (SELECT 1 FROM "{table}" t WHERE t.id = w.record_id)
+"""
+
 class UpdateWebhook(models.Model):
     _name = "update.webhook"
     _description = "Store webhook updates from FastAPI"
@@ -38,64 +46,133 @@ class UpdateWebhook(models.Model):
            - If create comes after write: Delete all previous writes
            - If write comes after create: Ignore the write (create already captures all data)
         """
-        created_records = self.env['update.webhook'].browse()
-        
-        for vals in vals_list:
-            try:
-                model = vals.get('model')
-                record_id = vals.get('record_id')
-                event = vals.get('event')
-                
-                if not model or not record_id or not event:
-                    _logger.warning(f"⚠️ Skipping invalid webhook vals: {vals}")
-                    continue
-                
-                # Check for existing records for this model + record_id
-                existing_records = self.search([
-                    ('model', '=', model),
-                    ('record_id', '=', record_id)
-                ])
-                
-                if existing_records:
-                    existing_events = existing_records.mapped('event')
-                    
-                    # Rule 1: If new event is 'create' and there are existing 'write' events
-                    # -> Delete all previous writes (create supersedes write)
-                    if event == 'create' and 'write' in existing_events:
-                        writes_to_delete = existing_records.filtered(lambda r: r.event == 'write')
-                        if writes_to_delete:
-                            writes_to_delete.unlink()
-                            _logger.info(f"🗑️ Deleted {len(writes_to_delete)} write events for {model}:{record_id} (create supersedes)")
-                    
-                    # Rule 2: If new event is 'write' and there's already a 'create' event
-                    # -> Skip this write (create already has all data)
-                    elif event == 'write' and 'create' in existing_events:
-                        _logger.info(f"⏭️ Skipping write event for {model}:{record_id} (create already exists)")
-                        continue
-                
-                # Create the new record
-                record = super(UpdateWebhook, self).create([vals])
-                created_records |= record
-                _logger.debug(f"✅ Webhook event created: {model}:{record_id} ({event})")
-                
-            except Exception as e:
-                # Log error but don't stop processing other events
-                _logger.error(f"❌ Error creating webhook event: {e}", exc_info=True)
-                
-                # Try to log to webhook.errors if available
-                try:
-                    if 'webhook.errors' in self.env:
-                        self.env['webhook.errors'].create({
-                            'model': vals.get('model', 'unknown'),
-                            'record_id': vals.get('record_id', 0),
-                            'error_message': str(e),
-                            'timestamp': fields.Datetime.now()
-                        })
-                except Exception:
-                    pass  # If even error logging fails, just continue
-        
+        to_create = self._apply_event_rules(vals_list)
+        if not to_create:
+            return self.browse()
+
+        # Errors surface to the caller; use create_single_safe() where the
+        # business operation must never fail because of an event
+        created_records = super(UpdateWebhook, self).create(to_create)
+        _logger.debug("✅ Webhook events created: %s", len(created_records))
         return created_records
 
+    @api.model
+    def create_single_safe(self, vals):
+        """
+        Create one event without ever raising
+
+        The insert runs in a savepoint so a failure does not abort the
+        caller's transaction; it is recorded in webhook.errors instead.
+
+        Args:
+            vals: update.webhook vals dict
+
+        Returns:
+            update.webhook record (empty on failure)
+        """
+        try:
+            with self.env.cr.savepoint():
+                return self.create(vals)
+        except Exception as e:
+            # Log error but don't block the business operation
+            _logger.error("❌ Error creating webhook event: %s", e, exc_info=True)
+            self._log_event_errors([vals], e)
+            return self.browse()
+
+    @api.model
+    def _log_event_errors(self, vals_list, error):
+        """Record failed event inserts in webhook.errors, if available"""
+        try:
+            if 'webhook.errors' in self.env:
+                now = fields.Datetime.now()
+                message = str(error)
+                self.env['webhook.errors'].create([{
+                    'model': vals.get('model', 'unknown'),
+                    'record_id': vals.get('record_id', 0),
+                    'error_message': message,
+                    'timestamp': now
+                } for vals in vals_list])
+        except Exception:
+            pass  # If even error logging fails, just continue
+
+    @api.model
+    def _apply_event_rules(self, vals_list):
+        """
+        Validate event vals and apply the create/write rules of create()
+
+        Existing events of every (model, record_id) pair are loaded with one
+        query; superseded writes are deleted with one unlink().
+
+        Args:
+            vals_list: List of update.webhook vals dicts
+
+        Returns:
+            list: The vals dicts that should be inserted
+        """
+        # Lightweight validation before touching the database
+        valid_vals = []
+        for vals in vals_list:
+            if not vals.get('model') or not vals.get('record_id') or not vals.get('event'):
+                _logger.warning("⚠️ Skipping invalid webhook vals: %s", vals)
+                continue
+            valid_vals.append(vals)
+        if not valid_vals:
+            return []
+
+        # One query for the existing events of every (model, record_id) pair
+        pairs = {(vals['model'], vals['record_id']) for vals in valid_vals}
+        self.flush_model(['model', 'record_id', 'event'])
+        self.env.cr.execute(
+            "SELECT id, model, record_id, event FROM update_webhook"
+            " WHERE (model, record_id) IN %s",
+            (tuple(pairs),)
+        )
+        seen_events = defaultdict(set)
+        existing_write_ids = defaultdict(list)
+        for event_id, model, record_id, event in self.env.cr.fetchall():
+            seen_events[(model, record_id)].add(event)
+            if event == 'write':
+                existing_write_ids[(model, record_id)].append(event_id)
+
+        # Apply the rules in Python, within the batch as well
+        to_create = []
+        batch_write_indexes = defaultdict(list)
+        write_ids_to_delete = []
+        for vals in valid_vals:
+            pair = (vals['model'], vals['record_id'])
+            event = vals['event']
+            events = seen_events[pair]
+
+            # Rule 1: If new event is 'create' and there are existing 'write' events
+            # -> Delete all previous writes (create supersedes write)
+            if event == 'create' and 'write' in events:
+                write_ids = existing_write_ids.pop(pair, [])
+                write_ids_to_delete.extend(write_ids)
+                batch_indexes = batch_write_indexes.pop(pair, [])
+                for index in batch_indexes:
+                    to_create[index] = None
+                events.discard('write')
+                _logger.info(
+                    "🗑️ Dropped %s write events for %s:%s (create supersedes)",
+                    len(write_ids) + len(batch_indexes), *pair
+                )
+
+            # Rule 2: If new event is 'write' and there's already a 'create' event
+            # -> Skip this write (create already has all data)
+            elif event == 'write' and 'create' in events:
+                _logger.info("⏭️ Skipping write event for %s:%s (create already exists)", *pair)
+                continue
+
+            if event == 'write':
+                batch_write_indexes[pair].append(len(to_create))
+            to_create.append(vals)
+            events.add(event)
+
+        if write_ids_to_delete:
+            self.browse(write_ids_to_delete).unlink()
+
+        return [vals for vals in to_create if vals is not None]
+
 
 
 class WebhookErrors(models.Model):
@@ -120,9 +197,23 @@ class WebhookCleanupCron(models.Model):
 
     @api.model
     def clean_webhook_records(self):
-        webhook_records = self.env['update.webhook'].search([])
-        for record in webhook_records:
-            model_obj = self.env.get(record.model)
-            if model_obj and not model_obj.search([('id', '=', record.record_id)]):
-                record.unlink()
-                _logger.info(f"🗑️ Removed orphaned webhook record_id {record.record_id} from {record.model}.")
\ No newline at end of file
+        """
+        Delete webhook events whose target record no longer exists
+
+        One anti-join DELETE per distinct model instead of a lookup and an
+        unlink per event.
+        """
+        cr = self.env.cr
+        self.env['update.webhook'].flush_model()
+        cr.execute("SELECT DISTINCT model FROM update_webhook")
+        for (model_name,) in cr.fetchall():
+            if model_name not in self.env:
+                continue
+            model_obj = self.env[model_name]
+            if model_obj._abstract or not model_obj._auto:
+                continue
+            model_obj.flush_model()
+            cr.execute(SQL_DELETE_ORPHANS.format(table=model_obj._table), (model_name,))
+            if cr.rowcount:
+                _logger.info("🗑️ Removed %s orphaned webhook records from %s.", cr.rowcount, model_name)
+        self.env['update.webhook'].invalidate_model()
@@ -1,12 +1,23 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError, ValidationError
+from odoo.sql_db import connection_info_for, db_connect
+from odoo.tools import split_every
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extras import Json, execute_values
 import logging
-import json
+import select
+import threading
+import time
 from datetime import timedelta
 
 _logger = logging.getLogger(__name__)
 
+# Long-poll requests allowed to wait for new events at the same time
+_MAX_EVENT_WAITERS = 8
+_EVENT_WAITERS = threading.BoundedSemaphore(_MAX_EVENT_WAITERS)
+
 
 class UpdateWebhook(models.Model):
     """
@@ -25,7 +36,7 @@ class UpdateWebhook(models.Model):
     _name = 'update.webhook'
     _description = 'Update Webhook - Pull-based Event Storage'
     _order = 'id desc'
-    _rec_name = 'display_name'
+    _rec_names_search = ['model', 'event']
 
     # === Basic Fields ===
     id = fields.Integer(
@@ -147,7 +158,6 @@ class UpdateWebhook(models.Model):
     display_name = fields.Char(
         string='Display Name',
         compute='_compute_display_name',
-        store=True,
         help='Human-readable event description'
     )
 
@@ -180,22 +190,26 @@ class UpdateWebhook(models.Model):
 
     @api.depends('payload')
     def _compute_payload_size(self):
-        """Compute payload size in bytes"""
+        """Compute payload size in bytes, as stored by PostgreSQL"""
+        stored = self.filtered('id')
+        sizes = {}
+        if stored.ids:
+            self.flush_model(['payload'])
+            self.env.cr.execute(
+                "SELECT id, pg_column_size(payload) FROM update_webhook WHERE id = ANY(%s)",
+                (stored.ids,)
+            )
+            sizes = dict(self.env.cr.fetchall())
         for record in self:
-            if record.payload:
-                try:
-                    record.payload_size = len(json.dumps(record.payload).encode('utf-8'))
-                except Exception:
-                    record.payload_size = 0
-            else:
-                record.payload_size = 0
+            record.payload_size = sizes.get(record.id) or 0
 
     @api.depends('timestamp')
     def _compute_age(self):
         """Compute age in days"""
+        now = fields.Datetime.now()
         for record in self:
             if record.timestamp:
-                delta = fields.Datetime.now() - record.timestamp
+                delta = now - record.timestamp
                 record.age_days = delta.days
             else:
                 record.age_days = 0
@@ -206,11 +220,6 @@ class UpdateWebhook(models.Model):
 
         # Composite indexes for common query patterns
         indexes = [
-            # Primary pull query: unprocessed events by ID
-            ('idx_update_webhook_pull',
-             'id, is_processed, is_archived',
-             "is_processed = false AND is_archived = false"),
-
             # Query by model and timestamp
             ('idx_update_webhook_model_time',
              'model, timestamp DESC'),
@@ -220,9 +229,10 @@ class UpdateWebhook(models.Model):
              'is_processed, timestamp',
              "is_processed = true"),
 
-            # Archive query
-            ('idx_update_webhook_archive',
-             'is_archived, timestamp'),
+            # Retention delete: archived events by age
+            ('idx_update_webhook_expired',
+             'timestamp',
+             "is_archived = true"),
 
             # Priority-based queries
             ('idx_update_webhook_priority',
@@ -233,28 +243,111 @@ class UpdateWebhook(models.Model):
              'user_id, timestamp DESC'),
         ]
 
+        # Superseded by idx_update_webhook_expired / idx_update_webhook_pending
+        self.env.cr.execute("DROP INDEX IF EXISTS idx_update_webhook_archive")
+        self.env.cr.execute("DROP INDEX IF EXISTS idx_update_webhook_pull")
+        # Superseded by idx_update_webhook_redelivery (keyed on the payload too)
+        self.env.cr.execute("DROP INDEX IF EXISTS idx_update_webhook_dedup")
+
         for index_name, columns, *where in indexes:
             where_clause = where[0] if where else None
             self._create_index_if_not_exists(index_name, columns, where_clause)
 
+        # Primary pull query: pending events by ID, covering the columns
+        # pull filters and returns (payload is too large, stays in the heap)
+        self._create_index_if_not_exists(
+            'idx_update_webhook_pending',
+            'id',
+            "is_processed = false AND is_archived = false",
+            include='model, record_id, event, timestamp, priority, category, user_id',
+        )
+
+        # Dedup: only true redeliveries (same record, event, second, config
+        # and payload) are dropped by ON CONFLICT DO NOTHING; distinct
+        # changes or rules within the same second each keep their row
+        self._create_index_if_not_exists(
+            'idx_update_webhook_redelivery',
+            'model, record_id, event, timestamp, COALESCE(config_id, 0), md5(payload::text)',
+            "is_processed = false AND is_archived = false",
+            unique=True,
+        )
+
+        # Wake long-polling pull requests when new events are inserted
+        # (statement-level, so bulk inserts send a single notification)
+        self.env.cr.execute("""
+            CREATE OR REPLACE FUNCTION update_webhook_notify() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_notify('webhook_new', '');
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS update_webhook_notify ON update_webhook;
+            CREATE TRIGGER update_webhook_notify
+                AFTER INSERT ON update_webhook
+                FOR EACH STATEMENT EXECUTE FUNCTION update_webhook_notify();
+        """)
+
         return res
 
-    def _create_index_if_not_exists(self, index_name, columns, where_clause=None):
-        """Helper method to create index if it doesn't exist"""
-        try:
-            self.env.cr.execute(f"""
-                SELECT 1 FROM pg_indexes
-                WHERE tablename = 'update_webhook'
-                AND indexname = '{index_name}'
-            """)
-
-            if not self.env.cr.fetchone():
-                where_sql = f" WHERE {where_clause}" if where_clause else ""
-                sql = f"CREATE INDEX {index_name} ON update_webhook ({columns}){where_sql}"
-                _logger.info(f"Creating index: {sql}")
-                self.env.cr.execute(sql)
-        except Exception as e:
-            _logger.warning(f"Failed to create index {index_name}: {e}")
+    def _create_index_if_not_exists(self, index_name, columns, where_clause=None, unique=False,
+                                    include=None):
+        """
+        Create an index on update_webhook once the current transaction commits
+
+        The index is built with CREATE INDEX CONCURRENTLY from a separate
+        autocommit connection, so writes to the table are not blocked while
+        it builds. Building it inside the module update transaction would
+        lock the table (and a concurrent build would wait on that very
+        transaction). An invalid index left by an interrupted build is
+        dropped and rebuilt.
+
+        Args:
+            index_name: Name of the index (quoted as an identifier)
+            columns: Column list SQL fragment
+            where_clause: Optional predicate SQL fragment for a partial index
+            unique: Whether to create a unique index
+            include: Optional non-key columns stored in the index (INCLUDE)
+        """
+        self.env.cr.execute("""
+            SELECT i.indisvalid
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = %s
+        """, (index_name,))
+        row = self.env.cr.fetchone()
+        if row and row[0]:
+            return
+
+        name = sql.Identifier(index_name)
+        statements = []
+        if row:
+            statements.append(sql.SQL("DROP INDEX CONCURRENTLY IF EXISTS {name}").format(name=name))
+        statements.append(sql.SQL(
+            "CREATE {unique}INDEX CONCURRENTLY IF NOT EXISTS {name} ON update_webhook ({columns}){include}{where}"
+        ).format(
+            unique=sql.SQL("UNIQUE " if unique else ""),
+            name=name,
+            columns=sql.SQL(columns),
+            include=sql.SQL(" INCLUDE (" + include + ")") if include else sql.SQL(""),
+            where=sql.SQL(" WHERE " + where_clause) if where_clause else sql.SQL(""),
+        ))
+        dbname = self.env.cr.dbname
+
+        @self.env.cr.postcommit.add
+        def build_index():
+            try:
+                with db_connect(dbname).cursor() as cr:
+                    cnx = cr._cnx
+                    cnx.autocommit = True
+                    try:
+                        for statement in statements:
+                            _logger.info("Creating index: %s", statement.as_string(cnx))
+                            cr._obj.execute(statement)
+                    finally:
+                        cnx.autocommit = False
+            except Exception as e:
+                _logger.warning("Failed to create index %s: %s", index_name, e)
 
     @api.model
     def create_event(self, model_name, record_id, event_type, payload_data, config=None):
@@ -269,7 +362,8 @@ class UpdateWebhook(models.Model):
             config: webhook.config record (optional)
 
         Returns:
-            update.webhook record or False
+            update.webhook record (empty when queued in batched mode,
+            deduplicated or superseded), or False on failure
         """
         try:
             vals = {
@@ -278,7 +372,7 @@ class UpdateWebhook(models.Model):
                 'event': event_type,
                 'payload': payload_data,
                 'timestamp': fields.Datetime.now(),
-                'user_id': self.env.user.id,
+                'user_id': self.env.uid,
                 'is_processed': False,
                 'is_archived': False,
             }
@@ -291,14 +385,98 @@ class UpdateWebhook(models.Model):
                     'category': config.category,
                 })
 
-            # Fast create without extra validations
-            # Use sudo() to avoid permission issues during write operations
-            return self.sudo().create(vals)
+            # Batched mode: defer to one multi-row INSERT at commit time
+            # (the create/write rules run when the queue is flushed)
+            if self.env.context.get('webhook_batch'):
+                self._bulk_queue([vals])
+                return self.browse()
+
+            # Same create/write rules as create(), then one INSERT whose
+            # ON CONFLICT drops redelivered duplicates instead of raising
+            # (savepoint: a failed insert must not abort the caller)
+            vals_list = self.sudo()._apply_event_rules([vals])
+            if not vals_list:
+                return self.browse()
+            with self.env.cr.savepoint(flush=False):
+                return self.sudo().browse(self._insert_event_rows(vals_list, returning=True))
 
         except Exception as e:
             _logger.error(f"Failed to create update.webhook event: {e}")
             return False
 
+    @api.model
+    def _bulk_queue(self, rows):
+        """
+        Queue events for a single multi-row INSERT before the transaction commits
+
+        Rows are kept on the cursor's precommit data and written with
+        execute_values from a precommit hook, so N events cost one round-trip
+        instead of N ORM creates. Queued events are not visible to searches
+        in the current transaction, and are dropped if it rolls back.
+
+        Args:
+            rows: List of dicts with create_event() vals keys
+        """
+        precommit = self.env.cr.precommit
+        queue = precommit.data.get('update.webhook.queue')
+        if queue is None:
+            queue = precommit.data['update.webhook.queue'] = []
+            precommit.add(self._flush_bulk_queue)
+        queue.extend(rows)
+
+    @api.model
+    def _flush_bulk_queue(self):
+        """
+        Insert the events queued by _bulk_queue() with execute_values
+
+        The queued rows get the same validation and create/write rules as
+        create(), applied once over the whole batch.
+        """
+        rows = self.env.cr.precommit.data.pop('update.webhook.queue', None)
+        if not rows:
+            return
+        rows = self.sudo()._apply_event_rules(rows)
+        if rows:
+            self._insert_event_rows(rows)
+
+    @api.model
+    def _insert_event_rows(self, rows, returning=False):
+        """
+        Insert events with one multi-row INSERT, bypassing the ORM
+
+        Pending events identical to one already stored (same model, record,
+        event, timestamp, config and payload) are dropped by
+        idx_update_webhook_redelivery.
+
+        Args:
+            rows: List of dicts with create_event() vals keys
+            returning: Whether to return the new IDs
+
+        Returns:
+            list: IDs of the rows actually inserted (empty unless returning)
+        """
+        now = fields.Datetime.now()
+        uid = self.env.uid
+        values = []
+        for row in rows:
+            timestamp = row.get('timestamp') or now
+            values.append((
+                row['model'], row['record_id'], row['event'],
+                Json(row.get('payload')), timestamp, row.get('user_id') or uid,
+                False, False, row.get('config_id') or None,
+                row.get('priority') or 'medium', row.get('category') or 'business',
+                uid, now, uid, now,
+            ))
+        result = execute_values(self.env.cr._obj, """
+            INSERT INTO update_webhook (
+                model, record_id, event, payload, timestamp, user_id,
+                is_processed, is_archived, config_id, priority, category,
+                create_uid, create_date, write_uid, write_date
+            ) VALUES %s
+            ON CONFLICT DO NOTHING
+        """ + (" RETURNING id" if returning else ""), values, page_size=1000, fetch=returning)
+        return [row[0] for row in result] if returning else []
+
     @api.model
     def create_bulk_events(self, events_data):
         """
@@ -313,7 +491,7 @@ class UpdateWebhook(models.Model):
         try:
             vals_list = []
             now = fields.Datetime.now()
-            user_id = self.env.user.id
+            user_id = self.env.uid
 
             for event in events_data:
                 vals = {
@@ -336,8 +514,11 @@ class UpdateWebhook(models.Model):
 
                 vals_list.append(vals)
 
-            # Bulk create
-            return self.sudo().create(vals_list)
+            # Same create/write rules as create(), then one multi-row INSERT
+            vals_list = self.sudo()._apply_event_rules(vals_list)
+            if not vals_list:
+                return self.browse()
+            return self.sudo().browse(self._insert_event_rows(vals_list, returning=True))
 
         except Exception as e:
             _logger.error(f"Failed to bulk create update.webhook events: {e}")
@@ -363,55 +544,23 @@ class UpdateWebhook(models.Model):
             }
         """
         try:
-            domain = [
-                ('id', '>', last_event_id),
-                ('is_processed', '=', False),
-                ('is_archived', '=', False),
-            ]
-
-            # Add model filter
-            if models:
-                domain.append(('model', 'in', models))
-
-            # Add priority filter
-            if priority:
-                domain.append(('priority', '=', priority))
-
-            # Search for events
-            events = self.sudo().search(
-                domain,
+            # One query: events with the user name resolved by join
+            self.flush_model()
+            events_data = list(self.sudo().iter_events(
+                last_event_id=last_event_id,
                 limit=limit,
-                order='id asc'
-            )
+                models=models,
+                priority=priority,
+            ))
 
             # Check if there are more events
             has_more = False
-            if events:
-                last_id = events[-1].id
-                has_more = bool(self.sudo().search_count([
-                    ('id', '>', last_id),
-                    ('is_processed', '=', False),
-                    ('is_archived', '=', False),
-                ]))
+            if events_data:
+                last_id = events_data[-1]['id']
+                has_more = self._has_pending_after(last_id)
             else:
                 last_id = last_event_id
 
-            # Format events for response
-            events_data = []
-            for event in events:
-                events_data.append({
-                    'id': event.id,
-                    'model': event.model,
-                    'record_id': event.record_id,
-                    'event': event.event,
-                    'timestamp': event.timestamp.isoformat() if event.timestamp else None,
-                    'payload': event.payload,
-                    'priority': event.priority,
-                    'category': event.category,
-                    'user_id': event.user_id.id if event.user_id else None,
-                    'user_name': event.user_id.name if event.user_id else None,
-                })
-
             return {
                 'events': events_data,
                 'last_id': last_id,
@@ -429,13 +578,181 @@ class UpdateWebhook(models.Model):
                 'error': str(e),
             }
 
+    @api.model
+    def iter_events(self, last_event_id=0, limit=100, models=None, priority=None,
+                    batch_size=200, raw_payload=False):
+        """
+        Stream unprocessed events for the pull API
+
+        Same filters and event shape as pull_events(), but rows are read
+        with one SQL query (user name resolved by join) and yielded one by
+        one, so callers can serialize them without holding the whole batch.
+
+        With raw_payload, the payload is returned as the JSON text
+        PostgreSQL already stores, so it is never decoded into Python
+        objects only to be encoded again.
+
+        Args:
+            last_event_id: Last event ID that was pulled (default: 0)
+            limit: Maximum number of events to return (default: 100)
+            models: List of model names to filter (optional)
+            priority: Priority filter (high/medium/low) (optional)
+            batch_size: Rows fetched from the cursor per round (default: 200)
+            raw_payload: Return payload as a JSON string (default: False)
+
+        Yields:
+            dict: Event data
+        """
+        payload_col = 'uw.payload::text' if raw_payload else 'uw.payload'
+        query = f"""
+            SELECT uw.id, uw.model, uw.record_id, uw.event,
+                   to_char(uw.timestamp, 'YYYY-MM-DD"T"HH24:MI:SS'),
+                   {payload_col}, uw.priority, uw.category, uw.user_id, p.name
+            FROM update_webhook uw
+            LEFT JOIN res_users u ON u.id = uw.user_id
+            LEFT JOIN res_partner p ON p.id = u.partner_id
+            WHERE uw.id > %s
+              AND uw.is_processed = false
+              AND uw.is_archived = false
+        """
+        params = [last_event_id]
+        if models:
+            query += " AND uw.model IN %s"
+            params.append(tuple(models))
+        if priority:
+            query += " AND uw.priority = %s"
+            params.append(priority)
+        query += " ORDER BY uw.id LIMIT %s"
+        params.append(limit)
+
+        cr = self.env.cr
+        cr.execute(query, params)
+        while True:
+            rows = cr.fetchmany(batch_size)
+            if not rows:
+                break
+            for (event_id, model, record_id, event, timestamp, payload,
+                 priority_, category, user_id, user_name) in rows:
+                yield {
+                    'id': event_id,
+                    'model': model,
+                    'record_id': record_id,
+                    'event': event,
+                    'timestamp': timestamp,
+                    'payload': payload,
+                    'priority': priority_,
+                    'category': category,
+                    'user_id': user_id,
+                    'user_name': user_name,
+                }
+
+    @api.model
+    def _has_pending_after(self, last_id):
+        """
+        Whether any unprocessed, unarchived event exists after last_id
+
+        EXISTS stops at the first matching row of idx_update_webhook_pending
+        instead of counting all of them.
+        """
+        self.flush_model(['is_processed', 'is_archived'])
+        self.env.cr.execute("""
+            SELECT EXISTS(
+                SELECT 1 FROM update_webhook
+                WHERE id > %s AND is_processed = false AND is_archived = false
+            )
+        """, (last_id,))
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _fast_pending_count(self):
+        """
+        Count pending events with a single raw COUNT
+
+        Skips ORM domain compilation and record rules; the predicate matches
+        the partial index idx_update_webhook_pending so this stays an index scan.
+
+        Returns:
+            int: Number of unprocessed, unarchived events
+        """
+        self.env.cr.execute("""
+            SELECT COUNT(*)
+            FROM update_webhook
+            WHERE is_processed = false AND is_archived = false
+        """)
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _max_event_id(self):
+        """
+        Highest event ID currently stored (0 when the table is empty)
+
+        Resolved from the primary key index; used by the pull API to answer
+        idle polls without running the full filtered search.
+        """
+        self.env.cr.execute("SELECT COALESCE(MAX(id), 0) FROM update_webhook")
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _wait_for_events(self, last_event_id, timeout):
+        """
+        Block until an event newer than last_event_id exists or timeout expires
+
+        Listens on the ``webhook_new`` channel from a dedicated connection,
+        since notifications are only delivered outside the request
+        transaction. The request cursor's snapshot cannot see rows committed
+        meanwhile, so the new maximum ID is read from that connection too.
+
+        The connection is opened outside Odoo's pool and closed afterwards,
+        so no pooled connection keeps the LISTEN subscription. At most
+        _MAX_EVENT_WAITERS requests wait at once (each also holds its
+        request cursor); beyond that the call returns without waiting and
+        the client simply polls again.
+
+        Args:
+            last_event_id: Last event ID the client has seen
+            timeout: Maximum time to wait, in seconds
+
+        Returns:
+            int: Highest event ID after waiting
+        """
+        if not _EVENT_WAITERS.acquire(blocking=False):
+            _logger.debug("Too many long-poll waiters, answering without waiting")
+            return self._max_event_id()
+        try:
+            deadline = time.monotonic() + timeout
+            conn = psycopg2.connect(**connection_info_for(self.env.cr.dbname)[1])
+            try:
+                conn.autocommit = True
+                with conn.cursor() as cr:
+                    cr.execute("LISTEN webhook_new")
+                    while True:
+                        # Checked after LISTEN so inserts in between are not missed
+                        cr.execute("SELECT COALESCE(MAX(id), 0) FROM update_webhook")
+                        max_id = cr.fetchone()[0]
+                        remaining = deadline - time.monotonic()
+                        if max_id > last_event_id or remaining <= 0:
+                            return max_id
+                        if select.select([conn], [], [], remaining) == ([], [], []):
+                            return max_id
+                        conn.poll()
+                        conn.notifies.clear()
+            finally:
+                conn.close()
+        finally:
+            _EVENT_WAITERS.release()
+
     def mark_as_processed(self):
-        """Mark events as processed"""
+        """Mark events as processed (direct UPDATE, no ORM write)"""
         try:
-            self.sudo().write({
-                'is_processed': True,
-                'processed_at': fields.Datetime.now(),
-            })
+            self.flush_recordset(['is_processed', 'processed_at'])
+            now = fields.Datetime.now()
+            for batch in split_every(1000, self.ids, list):
+                self.env.cr.execute("""
+                    UPDATE update_webhook
+                    SET is_processed = true, processed_at = %s
+                    WHERE id = ANY(%s)
+                """, (now, batch))
+            self.invalidate_recordset(['is_processed', 'processed_at'])
             _logger.info(f"Marked {len(self)} events as processed")
             return True
         except Exception as e:
@@ -447,61 +764,94 @@ class UpdateWebhook(models.Model):
         """
         Mark multiple events as processed (bulk operation)
 
+        Runs as UPDATE ... WHERE id = ANY(...) statements of at most 1000 IDs
+        each instead of an ORM write, and skips events that are already
+        processed.
+
         Args:
             event_ids: List of event IDs
+
+        Returns:
+            int: Number of events actually updated, or False on failure
         """
         try:
-            events = self.sudo().browse(event_ids)
-            events.write({
-                'is_processed': True,
-                'processed_at': fields.Datetime.now(),
-            })
-            _logger.info(f"Marked {len(events)} events as processed (batch)")
-            return True
+            self.flush_model(['is_processed', 'processed_at'])
+            updated = 0
+            for batch in split_every(1000, [int(event_id) for event_id in event_ids], list):
+                self.env.cr.execute("""
+                    UPDATE update_webhook
+                    SET is_processed = true, processed_at = (now() AT TIME ZONE 'UTC')
+                    WHERE id = ANY(%s) AND is_processed = false
+                    RETURNING id
+                """, (batch,))
+                updated += len(self.env.cr.fetchall())
+            self.invalidate_model(['is_processed', 'processed_at'])
+            _logger.info(f"Marked {updated} events as processed (batch)")
+            return updated
         except Exception as e:
             _logger.error(f"Failed to mark batch as processed: {e}")
             return False
 
     @api.model
-    def cleanup_old_events(self, days_to_archive=7, days_to_delete=30):
+    def cleanup_old_events(self, days_to_archive=7, days_to_delete=30, batch_size=10000):
         """
         Cleanup old events (called by cron)
 
+        Deletion runs in batches of ``batch_size`` rows, committing after
+        each one so row locks are released while ingest keeps running.
+
         Args:
             days_to_archive: Archive processed events older than this (default: 7 days)
             days_to_delete: Delete archived events older than this (default: 30 days)
+            batch_size: Maximum rows deleted per transaction (default: 10000)
         """
         try:
+            cr = self.env.cr
+            now = fields.Datetime.now()
+            self.flush_model(['is_processed', 'is_archived', 'timestamp'])
+
             # Step 1: Archive old processed events
-            archive_cutoff = fields.Datetime.now() - timedelta(days=days_to_archive)
-            to_archive = self.sudo().search([
-                ('is_processed', '=', True),
-                ('is_archived', '=', False),
-                ('timestamp', '<', archive_cutoff),
-            ])
-
-            if to_archive:
-                to_archive.write({
-                    'is_archived': True,
-                    'archived_at': fields.Datetime.now(),
-                })
-                _logger.info(f"Archived {len(to_archive)} old processed events")
+            archive_cutoff = now - timedelta(days=days_to_archive)
+            cr.execute("""
+                UPDATE update_webhook
+                   SET is_archived = true, archived_at = %s
+                 WHERE is_processed = true
+                   AND is_archived = false
+                   AND timestamp < %s
+            """, (now, archive_cutoff))
+            archived = cr.rowcount
+            if archived:
+                _logger.info("Archived %s old processed events", archived)
+
+            self.invalidate_model(['is_archived', 'archived_at'])
 
             # Step 2: Delete very old archived events
-            delete_cutoff = fields.Datetime.now() - timedelta(days=days_to_delete)
-            to_delete = self.sudo().search([
-                ('is_archived', '=', True),
-                ('timestamp', '<', delete_cutoff),
-            ])
-
-            if to_delete:
-                count = len(to_delete)
-                to_delete.unlink()
-                _logger.info(f"Deleted {count} very old archived events")
+            # (no foreign key points at update_webhook, so nothing to cascade)
+            delete_cutoff = now - timedelta(days=days_to_delete)
+            deleted = 0
+            while True:
+                cr.commit()
+                cr.execute("""
+                    DELETE FROM update_webhook
+                     WHERE id IN (
+                        SELECT id FROM update_webhook
+                         WHERE is_archived = true
+                           AND timestamp < %s
+                         LIMIT %s
+                           FOR UPDATE SKIP LOCKED
+                     )
+                """, (delete_cutoff, batch_size))
+                deleted += cr.rowcount
+                if cr.rowcount < batch_size:
+                    break
+            if deleted:
+                _logger.info("Deleted %s very old archived events", deleted)
+
+            self.invalidate_model()
 
             return {
-                'archived': len(to_archive) if to_archive else 0,
-                'deleted': count if to_delete else 0,
+                'archived': archived,
+                'deleted': deleted,
             }
 
         except Exception as e:
@@ -521,55 +871,35 @@ class UpdateWebhook(models.Model):
         """
         try:
             cutoff = fields.Datetime.now() - timedelta(days=days)
+            self.flush_model(['model', 'priority', 'timestamp', 'is_processed', 'is_archived'])
 
-            total = self.sudo().search_count([
-                ('timestamp', '>=', cutoff)
-            ])
-
-            processed = self.sudo().search_count([
-                ('timestamp', '>=', cutoff),
-                ('is_processed', '=', True),
-            ])
-
-            pending = self.sudo().search_count([
-                ('timestamp', '>=', cutoff),
-                ('is_processed', '=', False),
-                ('is_archived', '=', False),
-            ])
-
-            archived = self.sudo().search_count([
-                ('timestamp', '>=', cutoff),
-                ('is_archived', '=', True),
-            ])
-
-            # Events by model
+            # One scan for the totals and both breakdowns
             self.env.cr.execute("""
-                SELECT model, COUNT(*) as count
+                SELECT GROUPING(model), GROUPING(priority), model, priority,
+                       COUNT(*),
+                       COUNT(*) FILTER (WHERE is_processed),
+                       COUNT(*) FILTER (WHERE is_processed IS NOT TRUE AND is_archived IS NOT TRUE),
+                       COUNT(*) FILTER (WHERE is_archived)
                 FROM update_webhook
                 WHERE timestamp >= %s
-                GROUP BY model
-                ORDER BY count DESC
-                LIMIT 10
+                GROUP BY GROUPING SETS ((), (model), (priority))
             """, (cutoff,))
 
-            by_model = [
-                {'model': row[0], 'count': row[1]}
-                for row in self.env.cr.fetchall()
-            ]
-
-            # Events by priority
-            self.env.cr.execute("""
-                SELECT priority, COUNT(*) as count
-                FROM update_webhook
-                WHERE timestamp >= %s
-                GROUP BY priority
-                ORDER BY count DESC
-            """, (cutoff,))
-
-            by_priority = {
-                row[0]: row[1]
-                for row in self.env.cr.fetchall()
-            }
+            total = processed = pending = archived = 0
+            by_model = []
+            by_priority = {}
+            for g_model, g_priority, model, priority, count, n_processed, n_pending, n_archived \
+                    in self.env.cr.fetchall():
+                if g_model and g_priority:
+                    total, processed, pending, archived = count, n_processed, n_pending, n_archived
+                elif g_priority:
+                    by_model.append({'model': model, 'count': count})
+                else:
+                    by_priority[priority] = count
+
+            by_model.sort(key=lambda item: item['count'], reverse=True)
+            by_model = by_model[:10]
+            by_priority = dict(sorted(by_priority.items(), key=lambda item: item[1], reverse=True))
 
             return {
                 'period_days': days,
@@ -601,10 +931,13 @@ class UpdateWebhook(models.Model):
     def action_unmark_processed(self):
         """Action: Unmark events as processed (for re-processing)"""
         try:
-            self.sudo().write({
-                'is_processed': False,
-                'processed_at': False,
-            })
+            # Savepoint: re-opening an event whose identical twin is still
+            # pending violates idx_update_webhook_redelivery
+            with self.env.cr.savepoint():
+                self.sudo().write({
+                    'is_processed': False,
+                    'processed_at': False,
+                })
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
@@ -2,7 +2,6 @@
 
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
-from datetime import datetime
 import logging
 
 _logger = logging.getLogger(__name__)
@@ -27,7 +26,7 @@ class UserSyncState(models.Model):
         string='User',
         required=True,
         ondelete='cascade',
-        index=True,
+        # No index: unique_user_device (user_id, device_id) serves user_id lookups
         help='User who owns this sync state'
     )
 
@@ -160,49 +159,70 @@ class UserSyncState(models.Model):
         Returns:
             dict: Sync state record data
         """
-        # Search for existing state
-        existing = self.search([
-            ('user_id', '=', user_id),
-            ('device_id', '=', device_id)
-        ], limit=1)
-
-        if existing:
-            # Update app_type if different
-            if existing.app_type != app_type:
-                existing.write({'app_type': app_type})
-
-            _logger.info(f"Found existing sync state: {existing.id} for user {user_id}, device {device_id}")
-            return {
-                'id': existing.id,
-                'user_id': existing.user_id.id,
-                'device_id': existing.device_id,
-                'app_type': existing.app_type,
-                'last_event_id': existing.last_event_id,
-                'last_sync_time': existing.last_sync_time.isoformat() if existing.last_sync_time else None,
-                'sync_count': existing.sync_count,
-                'is_active': existing.is_active,
-            }
-
-        # Create new state
-        new_state = self.create({
+        # Raw SQL below bypasses @api.constrains('device_id') and the
+        # selection check the ORM applies to app_type
+        if not device_id or len(device_id) < 3:
+            raise ValidationError(_('Device ID must be at least 3 characters long'))
+        if app_type not in dict(self._fields['app_type'].selection):
+            raise ValidationError(_('Invalid app type: %s') % app_type)
+
+        # One race-free round trip: insert the state, or update app_type
+        # of the existing one; the CTE still sees the row as it was before
+        now = fields.Datetime.now()
+        self.flush_model()
+        self.env.cr.execute("""
+            WITH old AS (
+                SELECT app_type FROM user_sync_state
+                WHERE user_id = %(user_id)s AND device_id = %(device_id)s
+            )
+            INSERT INTO user_sync_state (
+                user_id, device_id, app_type, last_event_id, sync_count,
+                total_events_synced, is_active,
+                create_uid, create_date, write_uid, write_date
+            ) VALUES (
+                %(user_id)s, %(device_id)s, %(app_type)s, 0, 0,
+                0, true,
+                %(uid)s, %(now)s, %(uid)s, %(now)s
+            )
+            ON CONFLICT (user_id, device_id) DO UPDATE SET
+                app_type = EXCLUDED.app_type,
+                write_uid = CASE WHEN user_sync_state.app_type IS DISTINCT FROM EXCLUDED.app_type
+                                 THEN EXCLUDED.write_uid ELSE user_sync_state.write_uid END,
+                write_date = CASE WHEN user_sync_state.app_type IS DISTINCT FROM EXCLUDED.app_type
+                                  THEN EXCLUDED.write_date ELSE user_sync_state.write_date END
+            RETURNING id, last_event_id, last_sync_time, sync_count, is_active,
+                      (SELECT app_type FROM old)
+        """, {
             'user_id': user_id,
             'device_id': device_id,
             'app_type': app_type,
-            'last_event_id': 0,
-            'sync_count': 0,
-            'is_active': True,
+            'uid': self.env.uid,
+            'now': now,
         })
+        state_id, last_event_id, last_sync_time, sync_count, is_active, old_app_type = \
+            self.env.cr.fetchone()
+
+        state = self.browse(state_id)
+        state.invalidate_recordset()
+        if old_app_type != app_type:
+            # New state or app_type changed: refresh the stored display_name
+            self.env.add_to_compute(self._fields['display_name'], state)
+            state.flush_recordset(['display_name'])
+
+        if old_app_type is None:
+            _logger.info(f"Created new sync state: {state_id} for user {user_id}, device {device_id}")
+        else:
+            _logger.info(f"Found existing sync state: {state_id} for user {user_id}, device {device_id}")
 
-        _logger.info(f"Created new sync state: {new_state.id} for user {user_id}, device {device_id}")
         return {
-            'id': new_state.id,
-            'user_id': new_state.user_id.id,
-            'device_id': new_state.device_id,
-            'app_type': new_state.app_type,
-            'last_event_id': new_state.last_event_id,
-            'last_sync_time': None,
-            'sync_count': new_state.sync_count,
-            'is_active': new_state.is_active,
+            'id': state_id,
+            'user_id': user_id,
+            'device_id': device_id,
+            'app_type': app_type,
+            'last_event_id': last_event_id,
+            'last_sync_time': last_sync_time.isoformat() if last_sync_time else None,
+            'sync_count': sync_count,
+            'is_active': is_active,
         }
 
     @api.model
@@ -280,27 +300,42 @@ class UserSyncState(models.Model):
         _logger.info(f"Activated sync state {self.id}")
 
     @api.model
-    def cleanup_old_states(self, days=90):
+    def cleanup_old_states(self, days=90, batch_size=5000):
         """
         Cleanup inactive sync states older than specified days
 
+        Rows are deleted with direct SQL in batches of ``batch_size``;
+        rows locked by a concurrent sync are skipped (left for next run).
+
         Args:
             days (int): Number of days threshold
+            batch_size (int): Maximum rows deleted per statement
 
         Returns:
             int: Number of deleted records
         """
         from datetime import timedelta
 
-        cutoff_date = datetime.now() - timedelta(days=days)
-
-        old_states = self.search([
-            ('is_active', '=', False),
-            ('last_sync_time', '<', cutoff_date)
-        ])
-
-        count = len(old_states)
-        old_states.unlink()
+        cutoff_date = fields.Datetime.now() - timedelta(days=days)
+
+        # No foreign key points at user_sync_state, so nothing to cascade
+        self.flush_model(['is_active', 'last_sync_time'])
+        count = 0
+        while True:
+            self.env.cr.execute("""
+                DELETE FROM user_sync_state
+                WHERE id IN (
+                    SELECT id FROM user_sync_state
+                    WHERE is_active = false
+                      AND last_sync_time < %s
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+            """, (cutoff_date, batch_size))
+            count += self.env.cr.rowcount
+            if self.env.cr.rowcount < batch_size:
+                break
+        self.invalidate_model()
 
         _logger.info(f"Cleaned up {count} old sync states")
         return count
@@ -318,40 +353,74 @@ class UserSyncState(models.Model):
         Returns:
             dict: Statistics data
         """
-        domain = []
-        if user_id:
-            domain.append(('user_id', '=', user_id))
+        # Totals cover every state of the user when user_id is given; the
+        # device/app filters then only narrow by_app_type (as before)
+        filters = []
+        filter_params = []
         if device_id:
-            domain.append(('device_id', '=', device_id))
+            filters.append("device_id = %s")
+            filter_params.append(device_id)
         if app_type:
-            domain.append(('app_type', '=', app_type))
-
-        states = self.search(domain)
+            filters.append("app_type = %s")
+            filter_params.append(app_type)
+        filter_sql = " AND ".join(filters) or "TRUE"
+        if user_id:
+            where_sql, where_params = "user_id = %s", [user_id]
+            by_type_sql, by_type_params = filter_sql, filter_params
+        else:
+            where_sql, where_params = filter_sql, filter_params
+            by_type_sql, by_type_params = "TRUE", []
+
+        # One scan for the totals and the per-app-type breakdown
+        self.flush_model()
+        self.env.cr.execute(f"""
+            SELECT GROUPING(app_type), app_type,
+                   COUNT(*),
+                   COUNT(*) FILTER (WHERE is_active),
+                   COALESCE(SUM(sync_count), 0),
+                   COALESCE(SUM(total_events_synced), 0),
+                   MAX(last_sync_time),
+                   COUNT(*) FILTER (WHERE {by_type_sql})
+            FROM user_sync_state
+            WHERE {where_sql}
+            GROUP BY GROUPING SETS ((), (app_type))
+        """, by_type_params + where_params)
+
+        total_devices = active_devices = total_syncs = total_events_synced = 0
+        last_sync_time = None
+        by_app_type = dict.fromkeys((key for key, _label in self._fields['app_type'].selection), 0)
+        for g_app_type, state_app_type, count, active, syncs, events, last_sync, type_count \
+                in self.env.cr.fetchall():
+            if g_app_type:
+                total_devices, active_devices = count, active
+                total_syncs, total_events_synced = syncs, events
+                last_sync_time = last_sync
+            elif state_app_type in by_app_type:
+                by_app_type[state_app_type] = type_count
 
         # Get all devices for user if user_id is provided
         devices = []
         if user_id:
-            user_states = self.search([('user_id', '=', user_id)])
-            for state in user_states:
+            for state in self.search_read([('user_id', '=', user_id)], [
+                'device_id', 'app_type', 'last_sync_time', 'sync_count',
+                'total_events_synced', 'is_active',
+            ]):
                 devices.append({
-                    'device_id': state.device_id,
-                    'app_type': state.app_type,
-                    'last_sync_time': state.last_sync_time.isoformat() if state.last_sync_time else None,
-                    'sync_count': state.sync_count,
-                    'total_events_synced': state.total_events_synced,
-                    'is_active': state.is_active,
+                    'device_id': state['device_id'],
+                    'app_type': state['app_type'],
+                    'last_sync_time': state['last_sync_time'].isoformat() if state['last_sync_time'] else None,
+                    'sync_count': state['sync_count'],
+                    'total_events_synced': state['total_events_synced'],
+                    'is_active': state['is_active'],
                 })
 
         return {
             'user_id': user_id,
-            'total_devices': len(user_states) if user_id else len(states),
-            'active_devices': len(user_states.filtered('is_active')) if user_id else len(states.filtered('is_active')),
-            'total_syncs': sum(user_states.mapped('sync_count')) if user_id else sum(states.mapped('sync_count')),
-            'total_events_synced': sum(user_states.mapped('total_events_synced')) if user_id else sum(states.mapped('total_events_synced')),
-            'last_sync_time': max(user_states.mapped('last_sync_time') or [None]) if user_id else max(states.mapped('last_sync_time') or [None]),
-            'devices': devices if user_id else [],
-            'by_app_type': {
-                app_type: len(states.filtered(lambda s: s.app_type == app_type))
-                for app_type, _ in self._fields['app_type'].selection
-            }
+            'total_devices': total_devices,
+            'active_devices': active_devices,
+            'total_syncs': total_syncs,
+            'total_events_synced': total_events_synced,
+            'last_sync_time': last_sync_time.isoformat() if last_sync_time else None,
+            'devices': devices,
+            'by_app_type': by_app_type,
         }
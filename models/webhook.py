@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api, _
+from psycopg2.extensions import TRANSACTION_STATUS_INERROR
 import logging
 
 _logger = logging.getLogger(__name__)
@@ -17,56 +18,36 @@ class WebhookMixin(models.AbstractModel):
         # Call super first to create records
         records = super(WebhookMixin, self).create(vals_list)
 
+        # Cheap exit for models without a config tracking creates
+        config = self._get_mixin_config('create')
+        if not config:
+            return records
+
         # Track webhook events after successful creation
-        # Use savepoint to isolate webhook operations from main transaction
-        savepoint = None
         try:
-            # Check if webhook.config model exists and is accessible
-            if 'webhook.config' not in self.env:
-                return records
-            
             # Check if transaction is in a failed state
-            try:
-                self.env.cr.execute("SELECT 1")
-            except Exception:
+            if not self._tx_healthy():
                 # Transaction is in failed state, skip webhook tracking
                 _logger.warning(f"Transaction in failed state, skipping webhook tracking for {self._name}")
                 return records
-            
-            # Create savepoint to isolate webhook operations
-            savepoint = self.env.cr.savepoint()
-                
-            # Get webhook configuration for this model
-            config = self.env['webhook.config'].sudo().get_config_for_model(self._name)
-
-            if config and config.enabled and 'create' in config.events:
-                # Process individual events
-                for record in records:
-                    try:
-                        # Get corresponding vals for this record
-                        idx = records._ids.index(record.id) if hasattr(records, '_ids') else 0
-                        vals = vals_list[idx] if idx < len(vals_list) else vals_list[0]
-
-                        self._create_webhook_event(record, 'create', config, vals=vals)
-                    except Exception as e:
-                        # Log error for this specific record but continue
-                        _logger.error(f"Failed to create webhook event for {record._name}:{record.id}: {e}")
-                        # Rollback savepoint for this record
-                        if savepoint:
-                            try:
-                                self.env.cr.rollback(savepoint)
-                                savepoint = self.env.cr.savepoint()
-                            except Exception:
-                                # If savepoint rollback fails, skip remaining webhooks
-                                break
 
-        except Exception as e:
-            # Rollback savepoint on any error
-            if savepoint:
+            # Build every event first (no writes), then insert them at once
+            defaults = self._event_defaults(config)
+            names = self._get_record_names(records)
+            event_vals_list = []
+            # create() returns records in the order of vals_list
+            for record, vals in zip(records, vals_list):
                 try:
-                    self.env.cr.rollback(savepoint)
-                except Exception:
-                    pass
+                    event_vals_list.append(self._build_event_vals(
+                        record, 'create', defaults, vals=vals, record_name=names.get(record.id)
+                    ))
+                except Exception as e:
+                    # Log error for this specific record but continue
+                    _logger.error(f"Failed to create webhook event for {record._name}:{record.id}: {e}")
+
+            self._create_webhook_events(event_vals_list)
+
+        except Exception as e:
             # Log error but don't block the operation
             _logger.error(f"Failed to create webhook event for {self._name}: {e}", exc_info=True)
 
@@ -77,65 +58,47 @@ class WebhookMixin(models.AbstractModel):
         # Call super to perform write first - this is the critical operation
         result = super(WebhookMixin, self).write(vals)
 
+        # Cheap exit for models without a config tracking writes
+        config = self._get_mixin_config('write')
+        if not config:
+            return result
+
         # Track webhook events after successful write
         # Check transaction state IMMEDIATELY after write - before any webhook operations
-        try:
-            self.env.cr.execute("SELECT 1")
-        except Exception:
+        if not self._tx_healthy():
             # Transaction is in failed state, skip webhook tracking completely
             _logger.warning(f"Transaction in failed state after write, skipping webhook tracking for {self._name}")
             return result
-        
-        # Use a savepoint to isolate webhook operations from main transaction
-        savepoint = None
+
         try:
-            # Check if webhook.config model exists and is accessible
-            if 'webhook.config' not in self.env:
-                return result
-            
-            # Create savepoint to isolate webhook operations BEFORE any webhook calls
-            savepoint = self.env.cr.savepoint()
-                
-            # Get webhook configuration for this model
-            # This call is now inside savepoint, so any errors won't affect main transaction
-            config = self.env['webhook.config'].sudo().get_config_for_model(self._name)
-
-            if config and config.enabled and 'write' in config.events:
-                changed_fields = set(vals.keys())
-
-                for record in self:
-                    try:
-                        # Check if should track this event
-                        if config.should_track_event(record, 'write', changed_fields):
-                            # Don't use old_data - we didn't read it to avoid transaction issues
-                            # The payload will only contain new values
-                            self._create_webhook_event(
-                                record,
-                                'write',
-                                config,
-                                vals=vals,
-                                old_data=None,  # No old data to avoid transaction issues
-                                changed_fields=list(changed_fields)
-                            )
-                    except Exception as e:
-                        # Log error for this specific record but continue
-                        _logger.error(f"Failed to create webhook event for {record._name}:{record.id}: {e}")
-                        # Rollback savepoint for this record
-                        if savepoint:
-                            try:
-                                self.env.cr.rollback(savepoint)
-                                savepoint = self.env.cr.savepoint()
-                            except Exception:
-                                # If savepoint rollback fails, skip remaining webhooks
-                                break
+            changed_fields = set(vals.keys())
 
-        except Exception as e:
-            # Rollback savepoint on any error
-            if savepoint:
+            # Build every event first (no writes), then insert them at once
+            defaults = self._event_defaults(config)
+            names = self._get_record_names(self)
+            event_vals_list = []
+            for record in self:
                 try:
-                    self.env.cr.rollback(savepoint)
-                except Exception:
-                    pass
+                    # Check if should track this event
+                    if config.should_track_event(record, 'write', changed_fields):
+                        # Don't use old_data - we didn't read it to avoid transaction issues
+                        # The payload will only contain new values
+                        event_vals_list.append(self._build_event_vals(
+                            record,
+                            'write',
+                            defaults,
+                            vals=vals,
+                            old_data=None,  # No old data to avoid transaction issues
+                            changed_fields=list(changed_fields),
+                            record_name=names.get(record.id)
+                        ))
+                except Exception as e:
+                    # Log error for this specific record but continue
+                    _logger.error(f"Failed to create webhook event for {record._name}:{record.id}: {e}")
+
+            self._create_webhook_events(event_vals_list)
+
+        except Exception as e:
             # Log error but don't block the operation
             _logger.error(f"Failed to create webhook event for {self._name}: {e}", exc_info=True)
 
@@ -143,168 +106,238 @@ class WebhookMixin(models.AbstractModel):
 
     def unlink(self):
         """Override unlink to track webhook events"""
-        # Store record data before deletion
-        records_data = []
-        for record in self:
-            try:
-                records_data.append({
-                    'id': record.id,
-                    'data': record.read()[0]
-                })
-            except Exception as e:
-                _logger.warning(f"Could not read data for {record._name}:{record.id}: {e}")
-                records_data.append({'id': record.id, 'data': {}})
-
-        # Get webhook configuration before deleting
-        savepoint = None
+        # Cheap exit for models without a config tracking deletions
+        config = self._get_mixin_config('unlink')
+        if not config:
+            return super(WebhookMixin, self).unlink()
+
+        # Store record data before deletion, with one read() for all records
+        # (only the config's tracked fields when it has any)
+        fields_to_dump = [
+            name for name in config._get_cached_attrs()['filtered_fields']
+            if name in self._fields
+        ] or None
+        try:
+            records_data = [
+                {'id': data['id'], 'data': data}
+                for data in self.with_context(prefetch_fields=False).read(fields_to_dump)
+            ]
+        except Exception as e:
+            _logger.warning(f"Could not read data for {self._name}:{self.ids}: {e}")
+            records_data = [{'id': record_id, 'data': {}} for record_id in self.ids]
+
         try:
-            # Check if webhook.config model exists and is accessible
-            if 'webhook.config' not in self.env:
-                return super(WebhookMixin, self).unlink()
-            
             # Check if transaction is in a failed state
-            try:
-                self.env.cr.execute("SELECT 1")
-            except Exception:
+            if not self._tx_healthy():
                 # Transaction is in failed state, skip webhook tracking
                 _logger.warning(f"Transaction in failed state, skipping webhook tracking for {self._name}")
                 return super(WebhookMixin, self).unlink()
-            
-            # Create savepoint to isolate webhook operations
-            savepoint = self.env.cr.savepoint()
-            
-            config = self.env['webhook.config'].sudo().get_config_for_model(self._name)
-
-            if config and config.enabled and 'unlink' in config.events:
-                for record_data in records_data:
-                    try:
-                        # Create a temporary record-like object for checking
-                        record = self.browse(record_data['id'])
-
-                        if config.should_track_event(record, 'unlink', None):
-                            # Create webhook event before deletion
-                            self._create_webhook_event_for_deleted(
-                                record_data['id'],
-                                config,
-                                record_data['data']
-                            )
-                    except Exception as e:
-                        # Log error for this specific record but continue
-                        _logger.error(f"Failed to create webhook event for {self._name}:{record_data['id']}: {e}")
-                        # Rollback savepoint for this record
-                        if savepoint:
-                            self.env.cr.rollback(savepoint)
-                            savepoint = self.env.cr.savepoint()
-            
-            # Savepoints are automatically released on commit, no action needed
 
-        except Exception as e:
-            # Rollback savepoint on any error
-            if savepoint:
+            # Build every event first (no writes), then insert them at once
+            defaults = self._event_defaults(config)
+            event_vals_list = []
+            for record_data in records_data:
                 try:
-                    self.env.cr.rollback(savepoint)
-                except Exception:
-                    pass
+                    # Create a temporary record-like object for checking
+                    record = self.browse(record_data['id'])
+
+                    if config.should_track_event(record, 'unlink', None):
+                        # Create webhook event before deletion
+                        event_vals_list.append(self._build_deleted_event_vals(
+                            record_data['id'],
+                            defaults,
+                            record_data['data']
+                        ))
+                except Exception as e:
+                    # Log error for this specific record but continue
+                    _logger.error(f"Failed to create webhook event for {self._name}:{record_data['id']}: {e}")
+
+            self._create_webhook_events(event_vals_list)
+
+        except Exception as e:
             # Log error but don't block the operation
             _logger.error(f"Failed to create webhook event for {self._name}: {e}", exc_info=True)
 
         # Call super to perform deletion
         return super(WebhookMixin, self).unlink()
 
-    def _create_webhook_event(self, record, event_type, config, vals=None, old_data=None, changed_fields=None):
+    def _tx_healthy(self):
+        """
+        Check that the current transaction has not failed
+
+        Reads the libpq transaction status of the connection, so no round
+        trip to the database is needed.
+
+        Returns:
+            Boolean, False when the transaction is in a failed state
+        """
+        return self.env.cr._cnx.get_transaction_status() != TRANSACTION_STATUS_INERROR
+
+    def _get_mixin_config(self, event_type):
         """
-        Create webhook event with all metadata
+        Get the webhook configuration tracking an event type for this model
+
+        Answered from the registry-cached config map and config attributes,
+        so models without a config return before any SQL or savepoint.
 
         Args:
-            record: Record that triggered the event
             event_type: Type of event (create/write/unlink)
+
+        Returns:
+            webhook.config record (sudo), or None
+        """
+        config = self._webhook_config_for(self._name)
+        if config and event_type in config._get_cached_attrs()['events']:
+            return config
+        return None
+
+    def _get_record_names(self, records):
+        """
+        Read the display names of records in one batch
+
+        Records passed by the ORM overrides exist after create()/write(), so
+        no exists() probe is needed; other stored fields are not prefetched.
+
+        Args:
+            records: Recordset of this model
+
+        Returns:
+            Dictionary {record_id: display_name}
+        """
+        records = records.with_context(prefetch_fields=False)
+        return dict(zip(records.ids, records.mapped('display_name')))
+
+    def _event_defaults(self, config):
+        """
+        Build the event values shared by every event of a configuration
+
+        Args:
             config: webhook.config record
-            vals: Dictionary of new values
-            old_data: Dictionary of old values (for write events)
-            changed_fields: List of changed field names
+
+        Returns:
+            Dictionary of webhook.event values
         """
-        try:
-            # Build comprehensive payload
-            payload = self._build_event_payload(record, event_type, vals, old_data, changed_fields)
-
-            # Prepare event values
-            event_vals = {
-                'model': self._name,
-                'record_id': record.id,
-                'event': event_type,
-                'priority': config.priority,
-                'category': config.category,
-                'config_id': config.id,
-                'payload': payload,
-                'status': 'pending',
-            }
+        defaults = {
+            'model': self._name,
+            'priority': config.priority,
+            'category': config.category,
+            'config_id': config.id,
+            'status': 'pending',
+        }
 
-            # Add changed fields for write events
-            if event_type == 'write' and changed_fields:
-                event_vals['changed_fields'] = changed_fields
+        # Add template if configured
+        if config.template_id:
+            defaults['template_id'] = config.template_id.id
 
-            # Add template if configured
-            if config.template_id:
-                event_vals['template_id'] = config.template_id.id
+        # Add subscribers (use first subscriber if multiple)
+        subscribers = config.get_event_subscribers()
+        if subscribers:
+            defaults['subscriber_id'] = subscribers[0].id
 
-            # Add subscribers (use first subscriber if multiple)
-            subscribers = config.get_event_subscribers()
-            if subscribers:
-                event_vals['subscriber_id'] = subscribers[0].id
+        return defaults
 
-            # Create the event
-            self.env['webhook.event'].sudo().create(event_vals)
+    def _build_event_vals(self, record, event_type, defaults, vals=None, old_data=None, changed_fields=None,
+                          record_name=None):
+        """
+        Build webhook event values with all metadata (nothing is created)
 
-            _logger.debug(f"Created webhook event for {self._name}:{record.id} - {event_type}")
+        Args:
+            record: Record that triggered the event
+            event_type: Type of event (create/write/unlink)
+            defaults: Values from _event_defaults()
+            vals: Dictionary of new values
+            old_data: Dictionary of old values (for write events)
+            changed_fields: List of changed field names
+            record_name: Display name of the record (from _get_record_names())
 
-        except Exception as e:
-            _logger.error(f"Failed to create webhook event: {e}")
-            # Don't raise - we don't want to block the main operation
+        Returns:
+            Dictionary of webhook.event values
+        """
+        # Build comprehensive payload
+        payload = self._build_event_payload(
+            record, event_type, vals, old_data, changed_fields, record_name=record_name
+        )
+
+        event_vals = dict(defaults, record_id=record.id, event=event_type, payload=payload)
+
+        # Add changed fields for write events
+        if event_type == 'write' and changed_fields:
+            event_vals['changed_fields'] = changed_fields
 
-    def _create_webhook_event_for_deleted(self, record_id, config, record_data):
+        return event_vals
+
+    def _build_deleted_event_vals(self, record_id, defaults, record_data):
         """
-        Create webhook event for deleted record
+        Build webhook event values for a deleted record (nothing is created)
 
         Args:
             record_id: ID of deleted record
-            config: webhook.config record
+            defaults: Values from _event_defaults()
             record_data: Data of the deleted record
-        """
-        try:
-            # Build payload for deleted record
-            payload = {
-                'deleted_record': record_data,
-                'timestamp': fields.Datetime.now().isoformat(),
-            }
 
-            # Prepare event values
-            event_vals = {
-                'model': self._name,
-                'record_id': record_id,
-                'event': 'unlink',
-                'priority': config.priority,
-                'category': config.category,
-                'config_id': config.id,
-                'payload': payload,
-                'status': 'pending',
-            }
+        Returns:
+            Dictionary of webhook.event values
+        """
+        # Build payload for deleted record
+        payload = {
+            'deleted_record': record_data,
+            'timestamp': fields.Datetime.now().isoformat(),
+        }
+        return dict(defaults, record_id=record_id, event='unlink', payload=payload)
 
-            # Add template if configured
-            if config.template_id:
-                event_vals['template_id'] = config.template_id.id
+    def _create_webhook_events(self, event_vals_list):
+        """
+        Queue the collected webhook events for the transaction's precommit flush
 
-            # Add subscribers
-            subscribers = config.get_event_subscribers()
-            if subscribers:
-                event_vals['subscriber_id'] = subscribers[0].id
+        Events of the whole transaction are inserted together by
+        _flush_webhook_events() just before commit, so ORM operations return
+        without waiting on the INSERT, and nothing is inserted when the
+        transaction rolls back. Payloads are already fully built here.
 
-            # Create the event
-            self.env['webhook.event'].sudo().create(event_vals)
+        Args:
+            event_vals_list: List of webhook.event values
+        """
+        if not event_vals_list:
+            return
+        precommit = self.env.cr.precommit
+        pending = precommit.data.get('webhook.mixin.events')
+        if pending is None:
+            pending = precommit.data['webhook.mixin.events'] = []
+            precommit.add(self._flush_webhook_events)
+        pending.extend(event_vals_list)
+
+    @api.model
+    def _flush_webhook_events(self):
+        """
+        Insert the events queued by _create_webhook_events() with one create
 
+        The insert runs in a single savepoint. If it fails, the savepoint is
+        rolled back once and the events are retried one by one, so one bad
+        event does not drop the rest of the batch.
+        """
+        event_vals_list = self.env.cr.precommit.data.pop('webhook.mixin.events', None)
+        if not event_vals_list:
+            return
+        WebhookEvent = self.env['webhook.event'].sudo()
+        try:
+            with self.env.cr.savepoint():
+                WebhookEvent.create(event_vals_list)
+            _logger.debug(f"Created {len(event_vals_list)} webhook events")
         except Exception as e:
-            _logger.error(f"Failed to create webhook event for deleted record: {e}")
-
-    def _build_event_payload(self, record, event_type, vals=None, old_data=None, changed_fields=None):
+            _logger.warning(f"Bulk webhook event insert failed, retrying one by one: {e}")
+            for event_vals in event_vals_list:
+                try:
+                    with self.env.cr.savepoint():
+                        WebhookEvent.create(event_vals)
+                except Exception as e:
+                    _logger.error(
+                        f"Failed to create webhook event for {event_vals['model']}:{event_vals['record_id']}: {e}"
+                    )
+        # Precommit hooks run after the ORM flush; flush what they created
+        self.env.flush_all()
+
+    def _build_event_payload(self, record, event_type, vals=None, old_data=None, changed_fields=None,
+                             record_name=None):
         """
         Build comprehensive event payload
 
@@ -314,6 +347,7 @@ class WebhookMixin(models.AbstractModel):
             vals: New values
             old_data: Old values (for write events)
             changed_fields: Changed field names
+            record_name: Display name of the record (from _get_record_names())
 
         Returns:
             Dictionary containing event payload (all values JSON-serializable)
@@ -326,9 +360,9 @@ class WebhookMixin(models.AbstractModel):
         }
 
         try:
-            # Add record display name
-            if record.exists():
-                payload['record_name'] = record.display_name
+            # Add record display name (read for the whole batch beforehand)
+            if record_name is not None:
+                payload['record_name'] = record_name
 
             # Helper function to convert values to JSON-serializable format
             def json_serialize(value):
@@ -390,32 +424,16 @@ class WebhookMixin(models.AbstractModel):
         try:
             # For now, create individual events but mark them for batching
             # In a production system, you would implement a proper batch queue
-
-            for record in records:
-                # Create event marked for batch processing
-                event_vals = {
-                    'model': self._name,
-                    'record_id': record.id,
-                    'event': event_type,
-                    'priority': config.priority,
-                    'category': config.category,
-                    'config_id': config.id,
-                    'status': 'pending',
-                    'payload': {
-                        'batch': True,
-                        'batch_size': config.batch_size,
-                        'batch_timeout': config.batch_timeout,
-                    }
-                }
-
-                if config.template_id:
-                    event_vals['template_id'] = config.template_id.id
-
-                subscribers = config.get_event_subscribers()
-                if subscribers:
-                    event_vals['subscriber_id'] = subscribers[0].id
-
-                self.env['webhook.event'].sudo().create(event_vals)
+            defaults = self._event_defaults(config)
+            payload = {
+                'batch': True,
+                'batch_size': config.batch_size,
+                'batch_timeout': config.batch_timeout,
+            }
+            self._create_webhook_events([
+                dict(defaults, record_id=record.id, event=event_type, payload=dict(payload))
+                for record in records
+            ])
 
             _logger.info(f"Scheduled {len(records)} events for batch processing")
 
@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import ValidationError
 from odoo.tools.safe_eval import safe_eval
 import logging
@@ -188,6 +188,69 @@ class WebhookConfig(models.Model):
             record.pending_events = len(events.filtered(lambda e: e.status == 'pending'))
             record.failed_events = len(events.filtered(lambda e: e.status == 'failed'))
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Create configs and invalidate the tracked-models cache"""
+        records = super().create(vals_list)
+        self._webhook_invalidate_caches()
+        return records
+
+    def write(self, vals):
+        """Update configs and invalidate the tracked-models cache"""
+        result = super().write(vals)
+        self._webhook_invalidate_caches()
+        return result
+
+    def unlink(self):
+        """Delete configs and invalidate the tracked-models cache"""
+        result = super().unlink()
+        self._webhook_invalidate_caches()
+        return result
+
+    def _get_cached_attrs(self):
+        """
+        Parsed trigger attributes of this config, computed once
+
+        Served from _get_config_attrs(), which is invalidated whenever a
+        config or subscriber changes.
+
+        Returns:
+            dict: 'events' (frozenset of enabled operations),
+            'filtered_fields' (frozenset of field names),
+            'domain' (parsed filter domain, empty when unset or invalid) and
+            'subscriber_ids' (tuple of enabled, active subscriber IDs)
+        """
+        self.ensure_one()
+        return self._get_config_attrs(self.id)
+
+    @api.model
+    @tools.ormcache('config_id')
+    def _get_config_attrs(self, config_id):
+        """
+        Build the trigger attributes of a config
+
+        Args:
+            config_id: webhook.config ID
+
+        Returns:
+            dict: see _get_cached_attrs()
+        """
+        config = self.sudo().browse(config_id)
+        attrs = {
+            'events': frozenset((config.events or '').split(',')),
+            'filtered_fields': frozenset(config.filtered_fields.mapped('name')),
+            'domain': [],
+            'subscriber_ids': tuple(config.subscribers.filtered(
+                lambda sub: sub.enabled and sub.active
+            ).ids),
+        }
+        if config.filter_domain:
+            try:
+                attrs['domain'] = safe_eval(config.filter_domain) or []
+            except Exception as e:
+                _logger.warning('Domain filter error: %s', e)
+        return attrs
+
     @api.model
     def get_config_for_model(self, model_name):
         """
@@ -308,30 +371,29 @@ class WebhookConfig(models.Model):
         """
         self.ensure_one()
 
+        attrs = self._get_cached_attrs()
+
         # Check if this event type is tracked
-        tracked_events = self.events.split(',')
-        if event_type not in tracked_events:
+        if event_type not in attrs['events']:
             return False
 
         # Check filter domain
-        if self.filter_domain:
+        if attrs['domain']:
             try:
-                domain = safe_eval(self.filter_domain)
-                if not record.filtered_domain(domain):
+                if not record.filtered_domain(attrs['domain']):
                     return False
             except Exception as e:
                 _logger.error(f"Error evaluating filter domain: {e}")
                 # Continue if domain evaluation fails
 
         # Check filtered fields (only for write events)
-        if event_type == 'write' and self.filtered_fields:
+        if event_type == 'write' and attrs['filtered_fields']:
             # If no changed fields provided, track the event
             if not changed_fields:
                 return True
 
             # Check if any tracked field was changed
-            tracked_field_names = set(self.filtered_fields.mapped('name'))
-            if not tracked_field_names.intersection(changed_fields):
+            if attrs['filtered_fields'].isdisjoint(changed_fields):
                 return False
 
         return True
@@ -143,7 +143,7 @@ class WebhookRetry(models.Model):
                 self.write({
                     'resolution_status': 'resolved',
                     'resolved_at': fields.Datetime.now(),
-                    'resolved_by': self.env.user.id,
+                    'resolved_by': self.env.uid,
                     'resolution_notes': 'Manual retry successful',
                 })
 
@@ -218,12 +218,11 @@ class WebhookRetry(models.Model):
 
     def action_mark_ignored(self):
         """Mark event as ignored"""
-        for record in self:
-            record.write({
-                'resolution_status': 'ignored',
-                'resolved_at': fields.Datetime.now(),
-                'resolved_by': self.env.user.id,
-            })
+        self.write({
+            'resolution_status': 'ignored',
+            'resolved_at': fields.Datetime.now(),
+            'resolved_by': self.env.uid,
+        })
 
         return {
             'type': 'ir.actions.client',
@@ -15,11 +15,11 @@ Features:
 - Rate limiting per rule
 """
 
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import ValidationError
 from odoo.tools.safe_eval import safe_eval
+from .base_webhook_hook import _webhook_build_field_plan
 import logging
-import threading
 
 _logger = logging.getLogger(__name__)
 
@@ -39,15 +39,6 @@ class WebhookRule(models.Model):
     _order = 'sequence, model_name'
     _rec_name = 'name'
 
-    # ═══════════════════════════════════════════════════════════
-    # Class-level Cache (Thread-safe)
-    # ═══════════════════════════════════════════════════════════
-    
-    _rules_cache = {}
-    _tracked_models = set()
-    _cache_lock = threading.Lock()
-    _cache_valid = False
-
     # ═══════════════════════════════════════════════════════════
     # Fields
     # ═══════════════════════════════════════════════════════════
@@ -127,6 +118,13 @@ class WebhookRule(models.Model):
         help='Webhook endpoints to notify'
     )
 
+    has_active_subscribers = fields.Boolean(
+        string='Has Active Subscribers',
+        compute='_compute_has_active_subscribers',
+        store=True,
+        help='At least one enabled subscriber will receive push events'
+    )
+
     template_id = fields.Many2one(
         'webhook.template',
         string='Payload Template',
@@ -223,13 +221,26 @@ class WebhookRule(models.Model):
     # ═══════════════════════════════════════════════════════════
 
     def _compute_event_count(self):
-        """Count events created by this rule"""
+        """Count events created by these rules (one grouped query)"""
+        pairs = {(rule.model_name, rule.operation) for rule in self if rule.model_name}
+        counts = {}
+        if pairs:
+            self.env['update.webhook'].flush_model(['model', 'event'])
+            self.env.cr.execute("""
+                SELECT model, event, COUNT(*)
+                FROM update_webhook
+                WHERE (model, event) IN %s
+                GROUP BY model, event
+            """, (tuple(pairs),))
+            counts = {(model, event): count for model, event, count in self.env.cr.fetchall()}
+        for rule in self:
+            rule.event_count = counts.get((rule.model_name, rule.operation), 0)
+
+    @api.depends('subscriber_ids', 'subscriber_ids.enabled', 'subscriber_ids.active')
+    def _compute_has_active_subscribers(self):
+        """Flag rules with at least one enabled subscriber"""
         for rule in self:
-            count = self.env['update.webhook'].sudo().search_count([
-                ('model', '=', rule.model_name),
-                ('event', '=', rule.operation),
-            ])
-            rule.event_count = count
+            rule.has_active_subscribers = any(rule.subscriber_ids.mapped('enabled'))
 
     # ═══════════════════════════════════════════════════════════
     # Validation
@@ -269,73 +280,82 @@ class WebhookRule(models.Model):
 
     @api.model
     def _invalidate_cache(self):
-        """Invalidate the rules cache"""
-        with self._cache_lock:
-            WebhookRule._rules_cache = {}
-            WebhookRule._tracked_models = set()
-            WebhookRule._cache_valid = False
+        """Invalidate the rules cache (and the memoized domains / tracked fields)"""
+        self._webhook_invalidate_caches()
         _logger.info('Webhook rules cache invalidated')
 
     @api.model
-    def _rebuild_cache(self):
-        """Rebuild the rules cache from database"""
-        with self._cache_lock:
-            WebhookRule._rules_cache = {}
-            WebhookRule._tracked_models = set()
-            
-            # Load all active rules
-            rules = self.sudo().search([('active', '=', True)])
-            
-            for rule in rules:
-                cache_key = f"{rule.model_name}:{rule.operation}"
-                if cache_key not in WebhookRule._rules_cache:
-                    WebhookRule._rules_cache[cache_key] = []
-                WebhookRule._rules_cache[cache_key].append(rule.id)
-                WebhookRule._tracked_models.add(rule.model_name)
-            
-            WebhookRule._cache_valid = True
-            
+    @tools.ormcache()
+    def _get_rules_cache(self):
+        """
+        Rules cache, built from the database on first use
+
+        Builds one {model_name: tuple_of_rule_ids} dict per operation. Kept
+        in ormcache so an invalidation reaches every worker.
+
+        Returns:
+            tuple: ({operation: {model_name: rule_ids}}, tracked models)
+        """
+        by_operation = {'create': {}, 'write': {}, 'unlink': {}}
+        rules = self.sudo().search([('active', '=', True)])
+        for rule in rules:
+            by_operation[rule.operation].setdefault(rule.model_name, []).append(rule.id)
+
+        rule_maps = {
+            operation: {model: tuple(ids) for model, ids in by_model.items()}
+            for operation, by_model in by_operation.items()
+        }
+        tracked = frozenset(rules.mapped('model_name'))
+
         _logger.info(
-            f'Webhook rules cache rebuilt: '
-            f'{len(WebhookRule._tracked_models)} models, '
-            f'{len(rules)} rules'
+            'Webhook rules cache rebuilt: %s models, %s rules',
+            len(tracked), len(rules),
         )
+        return (rule_maps, tracked)
 
     @api.model
     def _get_tracked_models(self):
         """Get set of all tracked model names (fast check)"""
-        if not WebhookRule._cache_valid:
-            self._rebuild_cache()
-        return WebhookRule._tracked_models
+        return self._get_rules_cache()[1]
+
+    @api.model
+    def _get_rule_maps(self):
+        """
+        Per-operation rule lookup tables
+
+        Returns:
+            dict: {operation: {model_name: tuple of webhook.rule IDs}}
+        """
+        return self._get_rules_cache()[0]
+
+    @api.model
+    def _get_rule_ids_for(self, model_name, operation):
+        """
+        IDs of active rules for a model and operation
+
+        Returns:
+            tuple: webhook.rule IDs in rule order
+        """
+        return self._get_rule_maps()[operation].get(model_name, ())
 
     @api.model
     def _get_rules_for(self, model_name, operation):
         """
         Get active rules for a model and operation
-        
+
         Uses cache for performance (avoids DB query on every CRUD)
-        
+
         Args:
             model_name: Technical model name (e.g., 'sale.order')
             operation: Operation type ('create', 'write', 'unlink')
-            
+
         Returns:
             recordset of webhook.rule
         """
-        # Ensure cache is valid
-        if not WebhookRule._cache_valid:
-            self._rebuild_cache()
-        
-        cache_key = f"{model_name}:{operation}"
-        
-        # Get rule IDs from cache
-        rule_ids = WebhookRule._rules_cache.get(cache_key, [])
-        
+        rule_ids = self._get_rule_ids_for(model_name, operation)
         if not rule_ids:
             return self.browse()
-        
-        # Return rules recordset
-        return self.sudo().browse(rule_ids).exists()
+        return self.sudo().browse(rule_ids)
 
     # ═══════════════════════════════════════════════════════════
     # CRUD Overrides (Cache Invalidation)
@@ -351,7 +371,9 @@ class WebhookRule(models.Model):
     def write(self, vals):
         """Update rules and invalidate cache"""
         result = super().write(vals)
-        self._invalidate_cache()
+        # Bookkeeping writes on every trigger must not flush the caches
+        if vals.keys() - {'last_trigger'}:
+            self._invalidate_cache()
         return result
 
     def unlink(self):
@@ -364,33 +386,61 @@ class WebhookRule(models.Model):
     # Domain Matching
     # ═══════════════════════════════════════════════════════════
 
+    @tools.ormcache('self.id')
+    def _get_parsed_domain(self):
+        """
+        Evaluated domain filter of this rule
+
+        Memoized per rule until write()/unlink() invalidate the caches, so
+        safe_eval runs once per rule edit instead of once per triggered
+        record. Not keyed on write_date: every trigger writes last_trigger.
+
+        Returns:
+            list: Domain (empty when there is no filter or it fails to evaluate)
+        """
+        self.ensure_one()
+        if not self.domain or self.domain == '[]':
+            return []
+        try:
+            return safe_eval(self.domain) or []
+        except Exception as e:
+            _logger.warning(
+                f'Domain evaluation failed for rule {self.name}: {e}'
+            )
+            return []
+
+    @tools.ormcache('self.id')
+    def _get_tracked_fields_set(self):
+        """
+        Tracked field names of this rule, parsed once per rule edit
+
+        Returns:
+            frozenset: Field names (empty = all fields)
+        """
+        self.ensure_one()
+        if not self.tracked_fields:
+            return frozenset()
+        return frozenset(f.strip() for f in self.tracked_fields.split(',') if f.strip())
+
     def _match_domain(self, record):
         """
         Check if record matches the rule's domain filter
-        
+
         Args:
             record: Record to check
-            
+
         Returns:
             bool: True if matches (or no domain specified)
         """
         self.ensure_one()
-        
-        if not self.domain or self.domain == '[]':
+
+        domain = self._get_parsed_domain()
+        if not domain:
             return True
-        
+
         try:
-            domain = safe_eval(self.domain)
-            if not domain:
-                return True
-            
-            # Search for the record with the domain
-            matching = record.sudo().search([
-                ('id', '=', record.id)
-            ] + domain, limit=1)
-            
-            return bool(matching)
-            
+            # Evaluated in memory on the already loaded record
+            return bool(record.sudo().filtered_domain(domain))
         except Exception as e:
             _logger.warning(
                 f'Domain evaluation failed for rule {self.name}: {e}'
@@ -400,26 +450,18 @@ class WebhookRule(models.Model):
     def _match_tracked_fields(self, changed_vals):
         """
         Check if changed fields match tracked fields
-        
+
         Args:
             changed_vals: Dictionary of changed field values
-            
+
         Returns:
             bool: True if matches (or no tracked fields specified)
         """
         self.ensure_one()
-        
-        if not self.tracked_fields:
-            return True
-        
-        if not changed_vals:
-            return True
-        
-        tracked = set(f.strip() for f in self.tracked_fields.split(',') if f.strip())
-        changed = set(changed_vals.keys())
-        
-        # Return True if any tracked field was changed
-        return bool(tracked & changed)
+
+        tracked = self._get_tracked_fields_set()
+        # True if nothing is filtered or any tracked field was changed
+        return not tracked or not changed_vals or not tracked.isdisjoint(changed_vals)
 
     # ═══════════════════════════════════════════════════════════
     # Event Creation
@@ -428,75 +470,104 @@ class WebhookRule(models.Model):
     def trigger_event(self, record, operation, changed_vals=None):
         """
         Trigger a webhook event for a record
-        
+
         Args:
             record: The record that triggered the event
             operation: Operation type ('create', 'write', 'unlink')
             changed_vals: Changed values (for write operation)
-            
+
         Returns:
             update.webhook record or False
         """
         self.ensure_one()
-        
+
+        # Ensure record has an ID
+        if not record or not record.id:
+            _logger.warning(
+                f'Webhook trigger skipped for rule "{self.name}": '
+                f'Record has no ID (model: {record._name if record else "Unknown"})'
+            )
+            return False
+
+        events = self.trigger_events(record, operation, changed_vals)
+        return events[:1] or False
+
+    def trigger_events(self, records, operation, changed_vals=None, payloads=None):
+        """
+        Trigger webhook events for a batch of records
+
+        All update.webhook rows are inserted with one multi-row INSERT
+        (create_bulk_events(), via execute_values) and the rule's last
+        trigger time is written once for the batch.
+
+        Args:
+            records: Recordset that triggered the event
+            operation: Operation type ('create', 'write', 'unlink')
+            changed_vals: Changed values (for write operation)
+            payloads: Payload dicts already built for records, in order
+                (built here with one batched read when not given)
+
+        Returns:
+            update.webhook recordset (empty on failure)
+        """
+        self.ensure_one()
+        UpdateWebhook = self.env['update.webhook'].sudo()
+
         try:
-            # Ensure record has an ID
-            if not record or not record.id:
-                _logger.warning(
-                    f'Webhook trigger skipped for rule "{self.name}": '
-                    f'Record has no ID (model: {record._name if record else "Unknown"})'
-                )
-                return False
-            
+            if not records:
+                return UpdateWebhook
+
             # Update last trigger time
             self.sudo().write({'last_trigger': fields.Datetime.now()})
-            
-            # Prepare payload
-            payload_data = self._prepare_payload(record, changed_vals)
-            
-            # Get webhook config for additional metadata
-            config = self.env['webhook.config'].sudo().search([
-                ('model_name', '=', record._name)
-            ], limit=1)
-            
-            # Create event in update.webhook using the optimized create_event method
-            event = self.env['update.webhook'].sudo().create_event(
-                model_name=record._name,
-                record_id=record.id,
-                event_type=operation,
-                payload_data=payload_data,
-                config=config if config else None
-            )
-            
-            if not event:
-                _logger.warning(
-                    f'Failed to create webhook event for rule "{self.name}": '
-                    f'{record._name}:{record.id} ({operation})'
-                )
-                return False
-            
+
+            # Webhook config for additional metadata, from the cached map
+            config = records._webhook_config_for(records._name)
+
+            if payloads is None:
+                payloads = self._prepare_payloads(records)
+                if changed_vals:
+                    changed_fields = list(changed_vals.keys())
+                    for payload_data in payloads:
+                        payload_data['_changed_fields'] = changed_fields
+            payloads = list(zip(records, payloads))
+
+            # Create events in update.webhook with one multi-row create
+            events = UpdateWebhook.create_bulk_events([{
+                'model': record._name,
+                'record_id': record.id,
+                'event_type': operation,
+                'payload': payload_data,
+                'config': config,
+            } for record, payload_data in payloads])
+
+            # An empty result is not a failure: rows may have been superseded
+            # by the create/write rules or dropped as exact redeliveries by
+            # idx_update_webhook_redelivery; insert errors are already
+            # logged by create_bulk_events()
             _logger.debug(
-                f'Webhook event created by rule "{self.name}": '
-                f'{record._name}:{record.id} ({operation})'
+                'Webhook events stored by rule "%s": %s for %s %s (%s)',
+                self.name, len(events), records._name, records._ids, operation,
             )
-            
+
             # ALWAYS create webhook.event for subscribers (not just instant_send)
             # This ensures events appear in Webhook Events view
-            if self.subscriber_ids and not self.test_mode:
-                self._create_webhook_events(record, operation, payload_data, config)
-            
-            # Handle instant send - send immediately
-            if self.instant_send and self.subscriber_ids and not self.test_mode:
-                self._send_instant_events(record)
-            
-            return event
-            
+            if self.has_active_subscribers and not self.test_mode:
+                created = self.env['webhook.event'].sudo()
+                for record, payload_data in payloads:
+                    created |= self._create_webhook_events(record, operation, payload_data, config)
+
+                # Handle instant send - once the transaction commits
+                if self.instant_send and created:
+                    self._send_events_after_commit(created)
+
+            return events
+
         except Exception as e:
             _logger.error(
-                f'Failed to trigger webhook for rule "{self.name}": {e}',
+                'Failed to trigger webhook for rule "%s": %s', self.name, e,
                 exc_info=True
             )
-            return False
+            return UpdateWebhook
 
     def _prepare_payload(self, record, changed_vals=None):
         """
@@ -515,60 +586,10 @@ class WebhookRule(models.Model):
         if self.template_id:
             return self.template_id.render_template(record)
         
-        # Get fields to include
-        if self.tracked_fields:
-            fields_to_include = [f.strip() for f in self.tracked_fields.split(',') if f.strip()]
-        else:
-            # All readable fields (excluding internal ones)
-            fields_to_include = [
-                f for f in record._fields.keys()
-                if not f.startswith('_') and f not in [
-                    'create_uid', 'write_uid', '__last_update',
-                    'message_ids', 'message_follower_ids', 'activity_ids'
-                ]
-            ]
-        
-        # Build payload
-        data = {}
-        for field_name in fields_to_include:
-            try:
-                field = record._fields.get(field_name)
-                if not field:
-                    continue
-                
-                # Skip computed non-stored fields
-                if field.compute and not field.store:
-                    continue
-                
-                # Skip binary fields (just mark as present)
-                if field.type == 'binary':
-                    data[field_name] = bool(getattr(record, field_name, None))
-                    continue
-                
-                value = getattr(record, field_name, None)
-                
-                # Handle field types
-                if field.type == 'many2one':
-                    data[field_name] = {
-                        'id': value.id if value else False,
-                        'name': value.display_name if value else ''
-                    }
-                elif field.type in ['one2many', 'many2many']:
-                    data[field_name] = [
-                        {'id': r.id, 'name': r.display_name}
-                        for r in (value[:50] if value else [])  # Limit to 50
-                    ]
-                elif field.type == 'datetime':
-                    data[field_name] = value.isoformat() if value else False
-                elif field.type == 'date':
-                    data[field_name] = value.isoformat() if value else False
-                else:
-                    data[field_name] = value
-                    
-            except Exception as e:
-                _logger.warning(f'Failed to get field {field_name}: {e}')
-                data[field_name] = None
-        
+        # Build payload, loading each field separately so that one bad
+        # field is reported as None instead of failing the payload
+        data = record._webhook_getattr_payload(record, self._get_payload_fields(record))
+
         # Add metadata
         data['_metadata'] = {
             'model': record._name,
@@ -584,18 +605,78 @@ class WebhookRule(models.Model):
         
         return data
 
+    def _get_payload_fields(self, model):
+        """
+        Field plan of this rule's default payload for a model
+
+        Tracked fields, or all fields minus internal ones, skipping unknown
+        and computed non-stored fields (the same plan config payloads use).
+
+        Args:
+            model: Model (recordset) the payload is built for
+
+        Returns:
+            tuple: (field_name, _WH_FIELD_* code) pairs in payload order
+        """
+        self.ensure_one()
+        field_names = None
+        if self.tracked_fields:
+            field_names = [f.strip() for f in self.tracked_fields.split(',') if f.strip()]
+        return _webhook_build_field_plan(model._fields, field_names)
+
+    def _prepare_payloads(self, records):
+        """
+        Prepare payloads for a batch of records
+
+        Reads every payload field for the whole batch with a single read()
+        through the base hook's payload reader. Rules with a template (or a
+        failing read) fall back to _prepare_payload() per record.
+
+        Args:
+            records: Records to build payloads for
+
+        Returns:
+            list: Payload dicts, in the order of records
+        """
+        self.ensure_one()
+
+        if self.template_id or not records:
+            return [self._prepare_payload(record) for record in records]
+
+        try:
+            payloads = records._webhook_read_payloads(records, self._get_payload_fields(records))
+        except Exception as e:
+            _logger.warning('Bulk payload read failed for rule %s: %s', self.name, e)
+            return [self._prepare_payload(record) for record in records]
+
+        for record, data in zip(records, payloads):
+            # Add metadata
+            data['_metadata'] = {
+                'model': record._name,
+                'id': record.id,
+                'display_name': record.display_name,
+                'rule_id': self.id,
+                'rule_name': self.name,
+            }
+
+        return payloads
+
     def _create_webhook_events(self, record, operation, payload_data, config=None):
         """
         Create webhook.event entries for all subscribers
         This ensures events appear in Webhook Events view
+
+        Returns:
+            webhook.event recordset of the created events
         """
         self.ensure_one()
+        events = self.env['webhook.event'].sudo()
         
         if not record or not record.id:
-            return
+            return events
         
-        if not self.subscriber_ids:
-            return
+        if not self.has_active_subscribers:
+            return events
         
         for subscriber in self.subscriber_ids.filtered('enabled'):
             try:
@@ -615,7 +696,7 @@ class WebhookRule(models.Model):
                 if config:
                     event_vals['config_id'] = config.id
                 
-                self.env['webhook.event'].sudo().create(event_vals)
+                events |= self.env['webhook.event'].sudo().create(event_vals)
                 
                 _logger.debug(
                     f'Webhook event created for subscriber {subscriber.name}: '
@@ -625,6 +706,8 @@ class WebhookRule(models.Model):
             except Exception as e:
                 _logger.error(f'Failed to create webhook.event: {e}')
 
+        return events
+
     def _send_instant_events(self, record):
         """
         Send pending webhook events immediately (for instant_send rules)
@@ -647,17 +730,31 @@ class WebhookRule(models.Model):
         if not pending_events:
             return
         
+        self._send_events_after_commit(pending_events)
+
+    def _send_events_after_commit(self, events):
+        """
+        Send webhook events once the current transaction commits
+
+        One postcommit callback per batch; nothing is sent if the
+        transaction rolls back, and the request never commits early.
+
+        Args:
+            events: webhook.event records to send
+        """
+        event_ids = events.ids
+
         # Use after_commit to send webhooks after transaction completes
         # This avoids 502 errors caused by committing mid-transaction
         def send_webhooks():
-            for event in pending_events:
+            for event_id in event_ids:
                 try:
                     # Re-fetch event to ensure it still exists and is pending
-                    event_fresh = self.env['webhook.event'].sudo().browse(event.id)
+                    event_fresh = self.env['webhook.event'].sudo().browse(event_id)
                     if event_fresh.exists() and event_fresh.status == 'pending':
                         event_fresh._send_to_subscriber()
                 except Exception as e:
-                    _logger.error(f'Instant send failed for event {event.id}: {e}')
+                    _logger.error(f'Instant send failed for event {event_id}: {e}')
         
         # Schedule to run after commit
         self.env.cr.postcommit.add(send_webhooks)
@@ -740,7 +837,8 @@ class WebhookRule(models.Model):
 
     def action_refresh_cache(self):
         """Manually refresh the rules cache"""
-        self._rebuild_cache()
+        self._invalidate_cache()
+        self._get_rules_cache()
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
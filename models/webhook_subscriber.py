@@ -167,6 +167,20 @@ class WebhookSubscriber(models.Model):
             record.total_failed = failed
             record.success_rate = (sent / total * 100) if total > 0 else 0.0
 
+    def write(self, vals):
+        """Update subscribers; enabling or archiving changes who gets events"""
+        result = super().write(vals)
+        # Delivery bookkeeping (last_success_at, ...) must not flush caches
+        if 'enabled' in vals or 'active' in vals:
+            self._webhook_invalidate_caches()
+        return result
+
+    def unlink(self):
+        """Delete subscribers and invalidate cached subscriber lists"""
+        result = super().unlink()
+        self._webhook_invalidate_caches()
+        return result
+
     def send_event(self, event_id):
         """
         Send a single webhook event